@@ -1,8 +1,50 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
 
-from .models import Category, Comment, Location, Post
+from . import deletion
+
+from .models import (
+    AuthorStats,
+    Category,
+    CategoryStats,
+    Comment,
+    DeletedUser,
+    FeedEntry,
+    Location,
+    Post,
+    PostRanking,
+    QueuedEmail,
+    User,
+)
 
 admin.site.register(Category)
 admin.site.register(Location)
-admin.site.register(Post)
 admin.site.register(Comment)
+admin.site.register(QueuedEmail)
+admin.site.register(PostRanking)
+admin.site.register(AuthorStats)
+admin.site.register(CategoryStats)
+admin.site.register(FeedEntry)
+admin.site.register(DeletedUser)
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    # Comments are removed later by the `purge_deleted` job.
+    def delete_model(self, request, obj):
+        deletion.delete_post(obj)
+
+    def delete_queryset(self, request, queryset):
+        deletion.hide_posts(pk__in=list(queryset.values_list('pk', flat=True)))
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class DeferredDeletionUserAdmin(UserAdmin):
+    def delete_model(self, request, obj):
+        deletion.delete_users([obj])
+
+    def delete_queryset(self, request, queryset):
+        deletion.delete_users(queryset)
@@ -0,0 +1,61 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.utils.decorators import classonlymethod
+
+from . import views
+
+
+class AsyncViewMixin:
+    """Serve a synchronous class-based view as a coroutine.
+
+    The whole dispatch, including ORM access and template rendering, runs
+    in a worker thread of its own rather than in the single thread that
+    Django uses for synchronous views under ASGI, so the event loop keeps
+    serving other clients and requests do not queue behind each other.
+    """
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Mark the view as a coroutine function, as Django 4.1+ does for
+        # views with async handlers.
+        view._is_coroutine = asyncio.coroutines._is_coroutine
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        return await sync_to_async(
+            self.dispatch_and_render, thread_sensitive=False
+        )(request, *args, **kwargs)
+
+    def dispatch_and_render(self, request, *args, **kwargs):
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            return response
+        finally:
+            # Worker threads are not covered by the request_finished
+            # handler, so honour CONN_MAX_AGE here.
+            close_old_connections()
+
+
+class IndexListView(AsyncViewMixin, views.IndexListView):
+    pass
+
+
+class TrendingListView(AsyncViewMixin, views.TrendingListView):
+    pass
+
+
+class CategoryListView(AsyncViewMixin, views.CategoryListView):
+    pass
+
+
+class PostDetailView(AsyncViewMixin, views.PostDetailView):
+    pass
+
+
+class ProfileDetailView(AsyncViewMixin, views.ProfileDetailView):
+    pass
@@ -0,0 +1,141 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from . import feed
+from .models import (
+    Category,
+    Comment,
+    Location,
+    Post,
+    RenderedTextModel,
+    User,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """Run a benchmark against the configured database and discard
+    every row it created."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+@contextmanager
+def production_like() -> Iterator[None]:
+    with override_settings(
+        DEBUG=False,
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+    ):
+        yield
+
+
+def make_client(user=None) -> Client:
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+    return client
+
+
+VOCABULARY = (
+    'съешь же ещё этих мягких французских булок да выпей чаю блог '
+    'путешествие город море горы друзья впечатления фото день вечер'
+).split()
+
+
+def sample_text(words: int) -> str:
+    return ' '.join(random.choices(VOCABULARY, k=words)).capitalize()
+
+
+def rendered(rows: Iterable[RenderedTextModel]) -> List[RenderedTextModel]:
+    rows = list(rows)
+    for row in rows:
+        row.render_text()
+    return rows
+
+
+def create_sample_content(
+    posts: int, comments: int, words: int = 300
+) -> Post:
+    """Create published posts with `words` words of text each and add
+    `comments` comments to the newest one, which is returned."""
+    author = User.objects.create_user('bench_author')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Публикации для замеров', slug='bench'
+    )
+    location = Location.objects.create(name='Бенчмарк')
+    now = timezone.now()
+    Post.objects.bulk_create(
+        rendered(
+            Post(
+                title=f'Публикация {number}',
+                text=sample_text(words),
+                pub_date=now - timedelta(minutes=number + 1),
+                author=author,
+                category=category,
+                location=location,
+            )
+            for number in range(posts)
+        )
+    )
+    newest = Post.objects.filter(author=author).latest('pub_date')
+    Comment.objects.bulk_create(
+        rendered(
+            Comment(post=newest, author=author, text=sample_text(30))
+            for _ in range(comments)
+        )
+    )
+    # bulk_create() neither calls save() nor sends signals.
+    feed.refresh_where(author=author)
+    return newest
+
+
+@contextmanager
+def sample_content(
+    posts: int, comments: int, words: int = 300
+) -> Iterator[Post]:
+    """Commit sample content for benchmarks that serve requests from other
+    threads, which do not see a rolled back transaction, and delete it on
+    exit."""
+    post = create_sample_content(posts, comments, words)
+    try:
+        yield post
+    finally:
+        User.objects.filter(username='bench_author').delete()
+        Category.objects.filter(slug='bench').delete()
+        Location.objects.filter(name='Бенчмарк').delete()
+
+
+def timings(func: Callable[[], object], repeat: int) -> List[float]:
+    result = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        result.append(time.perf_counter() - started)
+    return result
+
+
+def summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'mean_ms': statistics.mean(ordered) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p99_ms': ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)]
+        * 1000,
+    }
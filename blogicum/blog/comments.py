@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db.models import Count, Max
+
+from .models import Comment, DeletedUser, Post, User
+
+# Comments may live in their own database (blog.routers), so they are
+# never joined with posts or users: ids are collected on one side and
+# looked up on the other, IN_BATCH_SIZE at a time.
+IN_BATCH_SIZE = 500
+
+
+def batches(ids: Iterable[int]) -> Iterator[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), IN_BATCH_SIZE):
+        yield ids[start:start + IN_BATCH_SIZE]
+
+
+def hidden_author_ids() -> List[int]:
+    return list(DeletedUser.objects.values_list('pk', flat=True))
+
+
+def deleted_post_ids() -> List[int]:
+    return list(
+        Post.all_objects.filter(deleted_at__isnull=False).values_list(
+            'pk', flat=True
+        )
+    )
+
+
+def activity(
+    key: str, ids: Iterable[int]
+) -> Dict[int, Tuple[int, Optional[datetime]]]:
+    """Count the comments, and find the newest one, per post or per
+    author (`key`), leaving out comments that deleted users wrote and
+    comments of deleted posts."""
+    comments = Comment.objects.exclude(author__in=hidden_author_ids())
+    if key == 'author':
+        comments = comments.exclude(post__in=deleted_post_ids())
+    result = {}
+    for batch in batches(ids):
+        for pk, count, last in (
+            comments.filter(**{f'{key}__in': batch})
+            .order_by()
+            .values(key)
+            .annotate(count=Count('id'), last=Max('created_at'))
+            .values_list(key, 'count', 'last')
+        ):
+            result[pk] = (count, last)
+    return result
+
+
+def counts(post_ids: Iterable[int]) -> Dict[int, int]:
+    result = {}
+    for batch in batches(post_ids):
+        result.update(
+            Comment.objects.filter(post__in=batch)
+            .order_by()
+            .values('post')
+            .annotate(count=Count('id'))
+            .values_list('post', 'count')
+        )
+    return result
+
+
+def add_counts(posts: List[Post]) -> List[Post]:
+    """Set `comment_count` on each of the posts."""
+    post_counts = counts(post.pk for post in posts)
+    for post in posts:
+        post.comment_count = post_counts.get(post.pk, 0)
+    return posts
+
+
+def author_ids(**lookups) -> List[int]:
+    return list(
+        Comment.objects.filter(**lookups)
+        .order_by()
+        .values_list('author', flat=True)
+        .distinct()
+    )
+
+
+def for_post(post: Post) -> List[Comment]:
+    """Comments of a post with their authors, oldest first."""
+    comments = list(
+        post.comments.exclude(author__in=hidden_author_ids())
+    )
+    authors = User.objects.in_bulk({comment.author_id for comment in comments})
+    for comment in comments:
+        comment.author = authors[comment.author_id]
+        comment.post = post
+    return comments
@@ -0,0 +1,102 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """Count post views in memory and add them to `Post.view_count` in
+    batches from a background thread, so that the detail page never
+    writes to the database."""
+
+    def __init__(self) -> None:
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def hit(self, post_id: int) -> None:
+        with self._lock:
+            self._counts[post_id] += 1
+        self.start()
+
+    def pending(self) -> Counter:
+        with self._lock:
+            return self._counts.copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def flush(self) -> int:
+        """Write the buffered views, one UPDATE per batch of posts, and
+        return the number of views written."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        items = list(counts.items())
+        size = settings.VIEW_COUNT_FLUSH_BATCH_SIZE
+        written = 0
+        for start in range(0, len(items), size):
+            batch = dict(items[start:start + size])
+            try:
+                update_view_counts(batch)
+            except DatabaseError:
+                logger.exception('Could not write %d post views', len(batch))
+                with self._lock:
+                    self._counts.update(batch)
+            else:
+                written += sum(batch.values())
+        return written
+
+    def start(self) -> None:
+        """Start the flushing thread of this process if not running, also
+        in a worker forked after it was started."""
+        if not settings.VIEW_COUNT_FLUSH_INTERVAL:
+            return
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid is None:
+                atexit.register(self.flush)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self.run, name='view-counter', daemon=True
+            )
+            self._thread.start()
+
+    def run(self) -> None:
+        while True:
+            time.sleep(settings.VIEW_COUNT_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+
+def update_view_counts(counts: dict) -> int:
+    return Post.objects.filter(pk__in=counts).update(
+        view_count=F('view_count')
+        + Case(
+            *(
+                When(pk=post_id, then=Value(count))
+                for post_id, count in counts.items()
+            ),
+            output_field=PositiveIntegerField(),
+        )
+    )
+
+
+post_views = ViewCounter()
@@ -0,0 +1,138 @@
+from collections import Counter
+from typing import Iterable
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import comments, feed, generations, stats, timelines
+from .models import (
+    AuthorStats,
+    CategoryStats,
+    Comment,
+    DeletedUser,
+    FeedEntry,
+    Post,
+    PostRanking,
+    User,
+)
+
+# Deleting a post deletes its comments, and deleting a user their posts and
+# comments, one by one with signals, in a single transaction that keeps
+# SQLite's write lock for as long as that takes. Instead, the rows are
+# hidden at once and removed by the `purge_deleted` job in small batches.
+
+
+@transaction.atomic
+def hide_posts(**lookups) -> int:
+    """Hide the posts matching `lookups` from every page, feed and
+    counter; their rows are left to `purge()`."""
+    posts = Post.objects.filter(**lookups)
+    authors, categories = set(), set()
+    for author_id, category_id in posts.values_list(
+        'author_id', 'category_id'
+    ).distinct():
+        authors.add(author_id)
+        categories.add(category_id)
+    commenters = set()
+    post_ids = list(posts.values_list('pk', flat=True))
+    for batch in comments.batches(post_ids):
+        commenters.update(comments.author_ids(post__in=batch))
+    hidden = posts.update(deleted_at=timezone.now())
+    for batch in comments.batches(post_ids):
+        FeedEntry.objects.filter(pk__in=batch).delete()
+        PostRanking.objects.filter(pk__in=batch).delete()
+    stats.rebuild(AuthorStats, authors | commenters)
+    stats.rebuild(CategoryStats, categories - {None})
+    for author_id in authors:
+        timelines.refresh(author_id)
+    for category_id in categories:
+        generations.bump('category', category_id)
+    return hidden
+
+
+def delete_post(post: Post) -> None:
+    hide_posts(pk=post.pk)
+
+
+@transaction.atomic
+def delete_users(users: Iterable[User]) -> None:
+    """Log the users out for good and hide their posts and comments."""
+    user_ids = [user.pk for user in users]
+    DeletedUser.objects.bulk_create(
+        [DeletedUser(user_id=pk) for pk in user_ids],
+        ignore_conflicts=True,
+    )
+    User.objects.filter(pk__in=user_ids).update(is_active=False)
+    hide_posts(author__in=user_ids)
+    # Their comments on other posts are not counted from now on.
+    categories = set()
+    for batch in comments.batches(
+        Comment.objects.filter(author__in=user_ids)
+        .values_list('post', flat=True)
+        .distinct()
+    ):
+        categories.update(
+            Post.all_objects.filter(pk__in=batch, category__isnull=False)
+            .values_list('category', flat=True)
+        )
+    stats.rebuild(CategoryStats, categories)
+
+
+def purge_comments() -> int:
+    hidden = Comment.objects.filter(
+        Q(post__in=comments.deleted_post_ids())
+        | Q(author__in=comments.hidden_author_ids())
+    )
+    using = router.db_for_write(Comment)
+    purged = 0
+    while True:
+        batch = list(
+            hidden.values_list('pk', 'post_id')[: settings.PURGE_BATCH_SIZE]
+        )
+        if not batch:
+            return purged
+        with transaction.atomic(using=using):
+            # Nothing refers to comments, and their delete signals would
+            # update the counters row by row: they are fixed up per post.
+            Comment.objects.filter(
+                pk__in=[pk for pk, _ in batch]
+            )._raw_delete(using)
+        for post_id, count in Counter(
+            post_id for _, post_id in batch
+        ).items():
+            feed.add_comments(post_id, -count)
+        purged += len(batch)
+
+
+def purge_posts() -> int:
+    posts = Post.all_objects.filter(deleted_at__isnull=False)
+    purged = 0
+    while True:
+        batch = list(
+            posts.values_list('pk', flat=True)[: settings.PURGE_BATCH_SIZE]
+        )
+        if not batch:
+            return purged
+        Post.all_objects.filter(pk__in=batch).delete()
+        purged += len(batch)
+
+
+def purge_users() -> int:
+    users = User.objects.filter(deletion__isnull=False)
+    purged = 0
+    for user in users:
+        if not (
+            Post.all_objects.filter(author=user).exists()
+            or Comment.objects.filter(author=user).exists()
+        ):
+            user.delete()
+            purged += 1
+    return purged
+
+
+def purge() -> int:
+    """Remove hidden comments, then hidden posts, then deleted users, in
+    batches of PURGE_BATCH_SIZE rows, each in its own transaction."""
+    return purge_comments() + purge_posts() + purge_users()
@@ -0,0 +1,99 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern
+from urllib.parse import quote
+
+from django.urls import get_resolver, get_script_prefix, reverse
+from django.urls.resolvers import RFC3986_SUBDELIMS, URLResolver
+
+SAFE_CHARACTERS = RFC3986_SUBDELIMS + '/~:@'
+
+
+class FastPattern:
+    """A URL pattern compiled into a %-format string and the converters
+    and regex that reverse() would check its arguments with."""
+
+    def __init__(
+        self,
+        template: str,
+        params: List[str],
+        converters: Dict[str, Any],
+        regex: str,
+    ) -> None:
+        self.template = template
+        self.params = params
+        self.converters = converters
+        self.regex: Pattern = re.compile(regex)
+
+    def format(self, args, kwargs) -> Optional[str]:
+        """Return the path of the URL, or None where reverse() would
+        refuse the arguments."""
+        if kwargs:
+            if args or set(kwargs) != set(self.params):
+                return None
+            values = kwargs
+        elif len(args) == len(self.params):
+            values = dict(zip(self.params, args))
+        else:
+            return None
+        subs = {}
+        for param, value in values.items():
+            converter = self.converters.get(param)
+            if converter is not None:
+                try:
+                    value = converter.to_url(value)
+                except ValueError:
+                    return None
+            subs[param] = str(value)
+        path = self.template % subs
+        if not self.regex.search(path):
+            return None
+        return path
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(
+    resolver: URLResolver, viewname: str
+) -> Optional[FastPattern]:
+    """Compile a pattern named by `viewname` or `namespace:viewname`, or
+    return None for patterns left to reverse(): nested namespaces, regex
+    prefixes, default arguments and names used more than once."""
+    prefix = ''
+    namespace, _, name = viewname.rpartition(':')
+    if namespace:
+        if ':' in namespace or namespace not in resolver.namespace_dict:
+            return None
+        prefix, resolver = resolver.namespace_dict[namespace]
+        if re.escape(prefix) != prefix:
+            return None
+    candidates = resolver.reverse_dict.getlist(name)
+    if len(candidates) != 1:
+        return None
+    possibilities, regex, defaults, converters = candidates[0]
+    if len(possibilities) != 1 or defaults:
+        return None
+    template, params = possibilities[0]
+    return FastPattern(
+        prefix.replace('%', '%%') + template,
+        params,
+        converters,
+        '^%s%s' % (prefix, regex),
+    )
+
+
+def fast_reverse(viewname: str, *args, **kwargs) -> str:
+    """Return the same URL as `reverse(viewname, args, kwargs)` with the
+    pattern formatted directly instead of searched by the resolver.
+
+    Application namespaces with several instances are not supported, as
+    there is no `current_app`.
+    """
+    pattern = compile_pattern(get_resolver(), viewname)
+    path = pattern and pattern.format(args, kwargs)
+    if path is None:
+        # reverse() raises the error for arguments that do not match.
+        return reverse(viewname, args=args or None, kwargs=kwargs or None)
+    url = quote(get_script_prefix() + path, safe=SAFE_CHARACTERS)
+    if url.startswith('//'):
+        return reverse(viewname, args=args or None, kwargs=kwargs or None)
+    return url
@@ -0,0 +1,142 @@
+from typing import Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from . import comments
+from .models import Category, FeedEntry, Location, Post, User
+
+
+def visible_posts():
+    # Scheduled posts are stored too and filtered by pub_date on read.
+    return (
+        Post.objects.filter(is_published=True, category__is_published=True)
+        .for_cards()
+        .order_by()
+    )
+
+
+def entry_for(post: Post) -> FeedEntry:
+    location = post.location
+    return FeedEntry(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt=post.excerpt,
+        image=post.image.name,
+        author_id=post.author_id,
+        author_username=post.author.username,
+        category_id=post.category_id,
+        category_title=post.category.title,
+        category_slug=post.category.slug,
+        location_id=post.location_id,
+        location_name=(
+            location.name if location and location.is_published else ''
+        ),
+        comment_count=post.comment_count,
+    )
+
+
+@transaction.atomic
+def refresh(post_ids: Iterable[int]) -> int:
+    """Rewrite the entries of the given posts, dropping invisible ones."""
+    post_ids = list(post_ids)
+    FeedEntry.objects.filter(pk__in=post_ids).delete()
+    posts = comments.add_counts(list(visible_posts().filter(pk__in=post_ids)))
+    return len(FeedEntry.objects.bulk_create(map(entry_for, posts)))
+
+
+def refresh_where(**lookups) -> int:
+    post_ids = list(
+        Post.objects.filter(**lookups)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    size = settings.FEED_REFRESH_BATCH_SIZE
+    return sum(
+        refresh(post_ids[start:start + size])
+        for start in range(0, len(post_ids), size)
+    )
+
+
+def rebuild() -> int:
+    """Rewrite the whole table batch by batch, also catching up on changes
+    made without signals, e.g. by bulk updates."""
+    entry_ids = FeedEntry.objects.values_list('pk', flat=True)
+    for batch in comments.batches(entry_ids):
+        # Posts may be in other databases (blog.shards).
+        existing = Post.objects.filter(pk__in=batch).values_list(
+            'pk', flat=True
+        )
+        FeedEntry.objects.filter(pk__in=set(batch) - set(existing)).delete()
+    return refresh_where()
+
+
+def category_changed(category: Category) -> None:
+    entries = FeedEntry.objects.filter(category=category)
+    if not category.is_published:
+        entries.delete()
+        return
+    entries.update(category_title=category.title, category_slug=category.slug)
+    # Posts of a category that has just been published again. Posts may be
+    # in other databases than their entries (blog.shards).
+    missing = set(
+        Post.objects.filter(category=category, is_published=True)
+        .values_list('pk', flat=True)
+    ) - set(entries.values_list('pk', flat=True))
+    for batch in comments.batches(sorted(missing)):
+        refresh(batch)
+
+
+def location_changed(location: Location) -> None:
+    FeedEntry.objects.filter(location=location).update(
+        location_name=location.name if location.is_published else ''
+    )
+
+
+def author_changed(author: User) -> None:
+    FeedEntry.objects.filter(author=author).update(
+        author_username=author.username
+    )
+
+
+def add_comments(post_id: int, count: int) -> None:
+    FeedEntry.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + count
+    )
+
+
+def as_posts(entries: Iterable[FeedEntry]) -> List[Post]:
+    """Turn entries into unsaved posts for the post_card.html template."""
+    posts = []
+    for entry in entries:
+        post = Post(
+            id=entry.post_id,
+            title=entry.title,
+            excerpt=entry.excerpt,
+            pub_date=entry.pub_date,
+            image=entry.image.name,
+            is_published=True,
+        )
+        post.author = User(id=entry.author_id, username=entry.author_username)
+        post.category = Category(
+            id=entry.category_id,
+            title=entry.category_title,
+            slug=entry.category_slug,
+            is_published=True,
+        )
+        post.location = (
+            Location(
+                id=entry.location_id,
+                name=entry.location_name,
+                is_published=True,
+            )
+            if entry.location_name
+            else None
+        )
+        # Cards depend on the location's generation even when it is hidden.
+        post.location_id = entry.location_id
+        post.comment_count = entry.comment_count
+        posts.append(post)
+    return posts
@@ -0,0 +1,48 @@
+import time
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+
+from . import replicas
+
+# Cached post cards and category pages include the generations of the
+# rows they were rendered from in their keys, so bumping one counter
+# retires every dependent entry at once; stale entries simply expire.
+# Counters start from the clock, so that a counter evicted from the cache
+# never comes back with a value that old entries were stored under.
+
+Dependency = Tuple[str, Optional[int]]
+
+
+def generation_key(kind: str, pk: int) -> str:
+    return f'generation:{kind}:{pk}'
+
+
+def bump(kind: str, pk: Optional[int]) -> None:
+    if pk is None:
+        return
+    key = generation_key(kind, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def stamp(*dependencies: Dependency) -> str:
+    """Return the current generations of the given (kind, pk) pairs as one
+    string for use in cache keys.
+
+    While the request reads from a replica, the string also names the
+    copy, so that rows read before a bump are not cached under it.
+    """
+    keys = [
+        generation_key(kind, pk)
+        for kind, pk in dependencies
+        if pk is not None
+    ]
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), None)
+            values[key] = cache.get(key)
+    return '.'.join(str(values[key]) for key in keys) + replicas.marker()
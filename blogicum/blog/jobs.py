@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from . import deletion, feed, maintenance, replicas, scheduler, trending
+from .mail import deliver_queued
+
+
+@scheduler.every(hours=1)
+def clear_expired_sessions() -> None:
+    # Rows are deleted in small batches so that a large backlog of expired
+    # sessions does not hold the SQLite write lock for long. Cache and
+    # cookie engines expire on their own, but rows left over from a
+    # database-backed engine are cleaned up as well.
+    expired = Session.objects.filter(expire_date__lt=timezone.now())
+    while True:
+        batch = list(
+            expired.values_list('pk', flat=True)[
+                : settings.SESSION_CLEANUP_BATCH_SIZE
+            ]
+        )
+        if not batch:
+            return
+        Session.objects.filter(pk__in=batch).delete()
+
+
+@scheduler.every(seconds=settings.EMAIL_QUEUE_INTERVAL)
+def deliver_queued_email() -> None:
+    # Keep draining while whole batches go out; stop at the first failure
+    # so that an unreachable server is retried with backoff.
+    while True:
+        sent, failed = deliver_queued()
+        if failed or sent < settings.EMAIL_QUEUE_BATCH_SIZE:
+            return
+
+
+@scheduler.every(seconds=settings.TRENDING_INTERVAL)
+def rank_trending_posts() -> None:
+    trending.update_rankings()
+
+
+@scheduler.every(seconds=settings.FEED_REBUILD_INTERVAL)
+def rebuild_feed() -> None:
+    feed.rebuild()
+
+
+@scheduler.every(seconds=settings.PURGE_INTERVAL)
+def purge_deleted() -> None:
+    deletion.purge()
+
+
+@scheduler.every(seconds=settings.REPLICA_COPY_INTERVAL)
+def copy_replicas() -> None:
+    replicas.copy_all()
+
+
+@scheduler.every(seconds=settings.BACKUP_INTERVAL)
+def backup_databases() -> None:
+    for alias in maintenance.databases():
+        maintenance.backup(alias)
+
+
+@scheduler.every(seconds=settings.OPTIMIZE_INTERVAL)
+def optimize_databases() -> None:
+    for alias in maintenance.databases():
+        maintenance.optimize(alias)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from typing import List, Sequence, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Store outgoing messages in the database and return at once.
+
+    Messages are delivered later by `deliver_queued_email` through
+    EMAIL_QUEUE_DELIVERY_BACKEND. Messages with attachments cannot be
+    stored and are handed to the delivery backend directly.
+    """
+
+    def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        queued = [
+            QueuedEmail.from_message(message)
+            for message in email_messages
+            if not message.attachments
+        ]
+        direct = [message for message in email_messages if message.attachments]
+        try:
+            QueuedEmail.objects.bulk_create(queued)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            queued = []
+        if direct:
+            get_connection(
+                settings.EMAIL_QUEUE_DELIVERY_BACKEND,
+                fail_silently=self.fail_silently,
+            ).send_messages(direct)
+        return len(queued) + len(direct)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(
+        seconds=min(
+            settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1),
+            settings.EMAIL_QUEUE_MAX_RETRY_DELAY,
+        )
+    )
+
+
+def _mark_failed(queued: QueuedEmail, error: Exception) -> None:
+    queued.attempts += 1
+    queued.last_error = f'{type(error).__name__}: {error}'
+    if queued.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        queued.status = QueuedEmail.Status.FAILED
+    else:
+        queued.next_attempt_at = timezone.now() + retry_delay(
+            queued.attempts
+        )
+
+
+def deliver_queued(batch_size: int = None) -> Tuple[int, int]:
+    """Send one batch of due messages over a single connection.
+
+    Return the numbers of sent and failed messages.
+    """
+    batch: List[QueuedEmail] = list(
+        QueuedEmail.objects.filter(
+            status=QueuedEmail.Status.PENDING,
+            next_attempt_at__lte=timezone.now(),
+        )[: batch_size or settings.EMAIL_QUEUE_BATCH_SIZE]
+    )
+    if not batch:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection(settings.EMAIL_QUEUE_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for queued in batch:
+            _mark_failed(queued, error)
+        failed = len(batch)
+    else:
+        try:
+            for queued in batch:
+                try:
+                    connection.send_messages([queued.to_message(connection)])
+                except Exception as error:
+                    _mark_failed(queued, error)
+                    failed += 1
+                else:
+                    queued.status = QueuedEmail.Status.SENT
+                    queued.sent_at = timezone.now()
+                    sent += 1
+        finally:
+            connection.close()
+    QueuedEmail.objects.bulk_update(
+        batch,
+        ('status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'),
+    )
+    return sent, failed
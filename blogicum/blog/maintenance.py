@@ -0,0 +1,151 @@
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# PRAGMA auto_vacuum of databases whose free pages can be given back to
+# the file system bit by bit with PRAGMA incremental_vacuum.
+INCREMENTAL = 2
+
+
+class Restarted(Exception):
+    pass
+
+
+def databases() -> List[str]:
+    """SQLite databases to back up and optimize; replicas are copies of
+    the main one."""
+    return [
+        alias
+        for alias, database in settings.DATABASES.items()
+        if database['ENGINE'] == 'django.db.backends.sqlite3'
+        and alias not in settings.REPLICAS
+    ]
+
+
+def copy(alias: str, target: str) -> Dict[str, float]:
+    """Copy a database into the file `target` with the online backup API.
+
+    BACKUP_PAGES pages are copied at a time, pausing BACKUP_PAUSE seconds
+    in between so that writers are not kept waiting. A write to the
+    database restarts the copy, which then starts over with twice as many
+    pages per step, so that it ends even while writes keep coming.
+    """
+    source = connections[alias]
+    source.ensure_connection()
+    pages = settings.BACKUP_PAGES
+    restarts = copied = 0
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal copied
+        if total - remaining < copied:
+            raise Restarted
+        copied = total - remaining
+        if remaining:
+            time.sleep(settings.BACKUP_PAUSE)
+
+    started = time.monotonic()
+    destination = sqlite3.connect(target)
+    try:
+        while True:
+            copied = 0
+            try:
+                source.connection.backup(
+                    destination, pages=pages, progress=progress
+                )
+            except Restarted:
+                restarts += 1
+                pages *= 2
+            else:
+                break
+    finally:
+        destination.close()
+    return {
+        'seconds': time.monotonic() - started,
+        'pages': copied,
+        'restarts': restarts,
+    }
+
+
+def backup(alias: str = 'default') -> Dict[str, float]:
+    """Write a backup of a database to BACKUP_DIR and delete all but the
+    BACKUP_KEEP latest backups of it.
+
+    The copy is renamed into place once complete, so the directory never
+    holds a partial one.
+    """
+    directory = Path(settings.BACKUP_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f'{alias}-{timezone.now():%Y%m%d-%H%M%S}.sqlite3'
+    partial = directory / f'{name}.part'
+    try:
+        result = copy(alias, str(partial))
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, directory / name)
+    for old in sorted(directory.glob(f'{alias}-*.sqlite3'))[
+        : -settings.BACKUP_KEEP
+    ]:
+        old.unlink()
+    logger.info(
+        'Backed up %s to %s in %.3fs (%d pages, %d restarts)',
+        alias, name, result['seconds'], result['pages'], result['restarts'],
+    )
+    return result
+
+
+def optimize(alias: str = 'default') -> Dict[str, float]:
+    """Refresh the statistics of the query planner and give up to
+    VACUUM_PAGES free pages back, returning the seconds of each step.
+
+    ANALYZE looks at about ANALYZE_LIMIT rows of each index. Free pages
+    are only given back by databases with PRAGMA auto_vacuum=INCREMENTAL
+    (`manage.py maintain_db --enable-incremental-vacuum`).
+    """
+    timings = {}
+    with connections[alias].cursor() as cursor:
+        started = time.monotonic()
+        cursor.execute(f'PRAGMA analysis_limit={settings.ANALYZE_LIMIT:d}')
+        cursor.execute('ANALYZE')
+        timings['analyze'] = time.monotonic() - started
+
+        started = time.monotonic()
+        cursor.execute('PRAGMA optimize')
+        timings['optimize'] = time.monotonic() - started
+
+        cursor.execute('PRAGMA auto_vacuum')
+        if cursor.fetchone()[0] == INCREMENTAL:
+            started = time.monotonic()
+            cursor.execute(
+                f'PRAGMA incremental_vacuum({settings.VACUUM_PAGES:d})'
+            )
+            # Every step of the statement frees one page.
+            cursor.fetchall()
+            timings['incremental_vacuum'] = time.monotonic() - started
+    logger.info(
+        'Optimized %s: %s',
+        alias,
+        ', '.join(
+            f'{step} {seconds:.3f}s' for step, seconds in timings.items()
+        ),
+    )
+    return timings
+
+
+def enable_incremental_vacuum(alias: str = 'default') -> float:
+    """Switch a database to PRAGMA auto_vacuum=INCREMENTAL. This rewrites
+    the whole file with VACUUM and blocks writers until it is done."""
+    started = time.monotonic()
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f'PRAGMA auto_vacuum={INCREMENTAL:d}')
+        cursor.execute('VACUUM')
+    return time.monotonic() - started
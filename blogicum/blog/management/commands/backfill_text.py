@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the excerpt and rendered HTML columns of posts and comments '
+        'saved before they existed or created with bulk operations.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-render every row, e.g. after changing the filters.',
+        )
+
+    def handle(self, *args, **options):
+        for model in (Post, Comment):
+            rows = model.objects.order_by('pk').only(
+                'text', *model.rendered_fields
+            )
+            if not options['all']:
+                rows = rows.filter(text_html='').exclude(text='')
+            total = 0
+            last_pk = 0
+            while True:
+                batch = list(
+                    rows.filter(pk__gt=last_pk)[: options['batch_size']]
+                )
+                if not batch:
+                    break
+                for row in batch:
+                    row.render_text()
+                model.objects.bulk_update(batch, model.rendered_fields)
+                total += len(batch)
+                last_pk = batch[-1].pk
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {total} rows'
+            )
@@ -0,0 +1,153 @@
+import asyncio
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test import RequestFactory, override_settings
+from django.urls import clear_url_caches, reverse
+
+from blog.benchmark import production_like, sample_content, summary
+
+
+@contextmanager
+def async_views(enabled):
+    """Rebuild the URLconf with or without blog.async_views."""
+    import blog.urls
+    import blogicum.urls
+
+    def reload():
+        importlib.reload(blog.urls)
+        importlib.reload(blogicum.urls)
+        clear_url_caches()
+
+    try:
+        with override_settings(ASYNC_VIEWS=enabled):
+            reload()
+            yield
+    finally:
+        reload()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput and latency of the WSGI handler with a fixed '
+        'pool of worker threads and of the ASGI handler with sync and '
+        'async views, for many clients reading responses slowly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='WSGI worker threads.',
+        )
+        parser.add_argument(
+            '--bandwidth',
+            type=int,
+            default=32,
+            help='Download speed of every client, KB/s.',
+        )
+        parser.add_argument('--posts', type=int, default=30)
+
+    def handle(self, *args, **options):
+        self.bandwidth = options['bandwidth'] * 1024
+        with production_like(), sample_content(options['posts'], 0) as post:
+            paths = [
+                reverse('blog:index'),
+                reverse('blog:category_posts', args=[post.category.slug]),
+                reverse('blog:post_detail', args=[post.id]),
+                reverse('blog:profile', args=[post.author.username]),
+            ]
+            paths = [
+                paths[number % len(paths)]
+                for number in range(options['clients'])
+            ]
+            self.stdout.write(
+                f'{"server":<20}{"req/s":>8}{"mean ms":>10}'
+                f'{"p50 ms":>10}{"p99 ms":>10}'
+            )
+            self.report(
+                f'wsgi, {options["workers"]} threads',
+                *self.run_wsgi(paths, options['workers']),
+            )
+            for enabled, name in ((False, 'asgi, sync views'),
+                                  (True, 'asgi, async views')):
+                with async_views(enabled):
+                    self.report(name, *self.run_asgi(paths))
+
+    def report(self, name, elapsed, latencies):
+        result = summary(latencies)
+        self.stdout.write(
+            f'{name:<20}{len(latencies) / elapsed:>8.1f}'
+            f'{result["mean_ms"]:>10.1f}{result["p50_ms"]:>10.1f}'
+            f'{result["p99_ms"]:>10.1f}'
+        )
+
+    def run_wsgi(self, paths, workers):
+        application = get_wsgi_application()
+        factory = RequestFactory()
+
+        def request(path, queued):
+            # A synchronous worker is busy until the client has read
+            # the whole response.
+            environ = factory._base_environ(PATH_INFO=path)
+            response = application(environ, lambda status, headers: None)
+            try:
+                for chunk in response:
+                    time.sleep(len(chunk) / self.bandwidth)
+            finally:
+                response.close()
+            return time.perf_counter() - queued
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(request, path, time.perf_counter())
+                for path in paths
+            ]
+            latencies = [future.result() for future in futures]
+        return time.perf_counter() - started, latencies
+
+    def run_asgi(self, paths):
+        application = get_asgi_application()
+
+        async def request(path):
+            started = time.perf_counter()
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [(b'host', b'testserver')],
+                'client': ('127.0.0.1', 0),
+                'server': ('testserver', 80),
+            }
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                # A slow client only holds a coroutine, not a thread.
+                body = message.get('body', b'')
+                await asyncio.sleep(len(body) / self.bandwidth)
+
+            await application(scope, receive, send)
+            return time.perf_counter() - started
+
+        async def run():
+            return await asyncio.gather(*(request(path) for path in paths))
+
+        started = time.perf_counter()
+        latencies = asyncio.run(run())
+        return time.perf_counter() - started, latencies
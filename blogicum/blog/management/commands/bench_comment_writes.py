@@ -0,0 +1,105 @@
+import threading
+import time
+from typing import Callable, List
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, router
+
+from blog.benchmark import sample_content, sample_text, summary
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Write comments, post edits and sessions from concurrent threads '
+        'for a while and report the throughput of each. Run it with and '
+        'without COMMENTS_DATABASE and SESSIONS_DATABASE to compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--commenters', type=int, default=8)
+        parser.add_argument('--editors', type=int, default=2)
+        parser.add_argument('--sessions', type=int, default=2)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            'databases: '
+            + ', '.join(
+                f'{model.__name__}={router.db_for_write(model)}'
+                for model in (Post, Comment, SessionStore.get_model_class())
+            )
+        )
+        with sample_content(options['posts'], 0) as post:
+            author = post.author
+            posts = list(Post.objects.filter(author=author))
+
+            def comment():
+                Comment.objects.create(
+                    post=post, author=author, text=sample_text(30)
+                )
+
+            def edit():
+                edited = posts[int(time.perf_counter() * 1000) % len(posts)]
+                edited.title = sample_text(3)
+                edited.save()
+
+            def session():
+                store = SessionStore()
+                store['bench'] = sample_text(5)
+                store.create()
+
+            workers = {
+                'comments': (comment, options['commenters']),
+                'post edits': (edit, options['editors']),
+                'sessions': (session, options['sessions']),
+            }
+            # The stats rows of the author and category exist from here.
+            comment()
+            results = self.run(workers, options['seconds'])
+        self.stdout.write(
+            f'{"writes":<12}{"per s":>8}{"locked":>8}'
+            f'{"mean ms":>10}{"p99 ms":>10}'
+        )
+        for name, (latencies, locked) in results.items():
+            result = summary(latencies or [0])
+            self.stdout.write(
+                f'{name:<12}{len(latencies) / options["seconds"]:>8.1f}'
+                f'{locked:>8}{result["mean_ms"]:>10.1f}'
+                f'{result["p99_ms"]:>10.1f}'
+            )
+
+    def run(self, workers, seconds):
+        deadline = time.perf_counter() + seconds
+        results = {name: ([], [0]) for name in workers}
+
+        def loop(write: Callable[[], None], latencies: List[float],
+                 locked: List[int]):
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        write()
+                    except OperationalError:
+                        # SQLite gave up waiting for the write lock.
+                        locked[0] += 1
+                    else:
+                        latencies.append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=loop, args=(write, *results[name]))
+            for name, (write, count) in workers.items()
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {
+            name: (latencies, locked[0])
+            for name, (latencies, locked) in results.items()
+        }
@@ -0,0 +1,73 @@
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.benchmark import (
+    create_sample_content,
+    rolled_back,
+    summary,
+    timings,
+)
+from blog.models import Post
+from blog.views import NUM_POST_PER_PAGE
+
+
+def payload(queryset) -> int:
+    """Bytes of column values the database returns for a queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(
+            len(str(value).encode())
+            for row in cursor.fetchall()
+            for value in row
+            if value is not None
+        )
+
+
+def peak_memory(queryset) -> int:
+    tracemalloc.start()
+    try:
+        list(queryset.all())
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare bytes fetched, peak memory and time of loading one feed '
+        'page with every column and with the post card columns only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100)
+        parser.add_argument('--words', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            create_sample_content(options['posts'], 0, options['words'])
+            page = Post.objects.order_by('-pub_date')
+            querysets = {
+                'all columns': page.select_related(
+                    'author', 'category', 'location'
+                )[:NUM_POST_PER_PAGE],
+                'card columns': page.for_cards()[:NUM_POST_PER_PAGE],
+            }
+            self.stdout.write(
+                f'{"queryset":<14}{"bytes":>10}{"peak KiB":>10}'
+                f'{"mean ms":>10}{"p99 ms":>10}'
+            )
+            for name, queryset in querysets.items():
+                result = summary(
+                    timings(
+                        lambda: list(queryset.all()), options['repeat']
+                    )
+                )
+                self.stdout.write(
+                    f'{name:<14}{payload(queryset):>10}'
+                    f'{peak_memory(queryset) / 1024:>10.1f}'
+                    f'{result["mean_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+                )
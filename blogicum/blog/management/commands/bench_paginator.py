@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import engines
+from django.template.loader import get_template
+
+from blog.benchmark import summary, timings
+from blog.views import NUM_POST_PER_PAGE
+
+# includes/paginator.html before page links were elided.
+FULL_RANGE_TEMPLATE = '''
+{% for i in page_obj.paginator.page_range %}
+  {% if page_obj.number == i %}
+    <li class="page-item active">
+      <span class="page-link">{{ i }}</span>
+    </li>
+  {% else %}
+    <li class="page-item">
+      <a class="page-link" href="?page={{ i }}">{{ i }}</a>
+    </li>
+  {% endif %}
+{% endfor %}
+'''
+PAGES = (1_000, 10_000, 100_000)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare size and rendering time of the paginator with every page '
+        'linked and with elided page links.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        templates = {
+            'full': engines['django'].from_string(FULL_RANGE_TEMPLATE),
+            'elided': get_template('includes/paginator.html'),
+        }
+        self.stdout.write(
+            f'{"pages":>8} {"paginator":<10}{"bytes":>12}'
+            f'{"mean ms":>10}{"p99 ms":>10}'
+        )
+        for pages in PAGES:
+            paginator = Paginator(
+                range(pages * NUM_POST_PER_PAGE), NUM_POST_PER_PAGE
+            )
+            context = {'page_obj': paginator.page(pages // 2)}
+            for name, template in templates.items():
+                size = len(template.render(context).encode())
+                result = summary(
+                    timings(
+                        lambda: template.render(context), options['repeat']
+                    )
+                )
+                self.stdout.write(
+                    f'{pages:>8} {name:<10}{size:>12}'
+                    f'{result["mean_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+                )
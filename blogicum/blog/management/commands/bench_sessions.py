@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.benchmark import make_client, production_like, rolled_back
+from blog.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare database queries per request of a logged-in reader of '
+        'blog:index for every session strategy.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20)
+
+    def handle(self, *args, **options):
+        url = reverse('blog:index')
+        n = options['requests']
+        self.stdout.write(
+            f'{"strategy":<16}{"queries/req":>12}{"session/req":>12}'
+        )
+        with production_like(), rolled_back():
+            user = User.objects.create_user('bench_sessions_reader')
+            for strategy, engine in settings.SESSION_ENGINES.items():
+                with override_settings(SESSION_ENGINE=engine):
+                    client = make_client(user)
+                    client.get(url)
+                    with CaptureQueriesContext(connection) as ctx:
+                        for _ in range(n):
+                            client.get(url)
+                session_queries = [
+                    query
+                    for query in ctx.captured_queries
+                    if 'django_session' in query['sql']
+                ]
+                self.stdout.write(
+                    f'{strategy:<16}{len(ctx) / n:>12.2f}'
+                    f'{len(session_queries) / n:>12.2f}'
+                )
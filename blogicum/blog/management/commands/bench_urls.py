@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from blog.benchmark import summary, timings
+from blog.fast_urls import fast_reverse
+
+# URLs of a post card and of a comment.
+URLS = (
+    ('blog:post_detail', (123,)),
+    ('blog:profile', ('bench_author',)),
+    ('blog:category_posts', ('bench',)),
+    ('blog:edit_comment', (123, 4567)),
+    ('blog:delete_comment', (123, 4567)),
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare reverse() and blog.fast_urls on the URLs of feed pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        calls = options['calls']
+        functions = {
+            'reverse': lambda name, args: reverse(name, args=args),
+            'fast_reverse': lambda name, args: fast_reverse(name, *args),
+        }
+        self.stdout.write(
+            f'{"url":<22}{"function":<14}{"us/call":>10}{"p99 us":>10}'
+        )
+        for name, url_args in URLS:
+            for label, function in functions.items():
+                result = summary(
+                    timings(
+                        lambda: [
+                            function(name, url_args) for _ in range(calls)
+                        ],
+                        options['repeat'],
+                    )
+                )
+                self.stdout.write(
+                    f'{name:<22}{label:<14}'
+                    f'{result["mean_ms"] * 1000 / calls:>10.2f}'
+                    f'{result["p99_ms"] * 1000 / calls:>10.2f}'
+                )
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import maintenance
+
+TASKS = ('backup', 'optimize')
+
+
+class Command(BaseCommand):
+    help = (
+        'Back up the SQLite databases online to BACKUP_DIR and run ANALYZE, '
+        'PRAGMA optimize and an incremental vacuum on them, reporting how '
+        'long each step took.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tasks',
+            nargs='*',
+            help='Run only these tasks: ' + ', '.join(TASKS) + '.',
+        )
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Maintain only this database; may be repeated.',
+        )
+        parser.add_argument(
+            '--enable-incremental-vacuum',
+            action='store_true',
+            help=(
+                'Switch the databases to PRAGMA auto_vacuum=INCREMENTAL '
+                'first. This rewrites each file and blocks writers.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['tasks']) - set(TASKS)
+        if unknown:
+            raise CommandError('Unknown task: ' + ', '.join(sorted(unknown)))
+        databases = options['databases'] or maintenance.databases()
+        unknown = set(databases) - set(maintenance.databases())
+        if unknown:
+            raise CommandError(
+                'Not a maintained SQLite database: '
+                + ', '.join(sorted(unknown))
+            )
+        tasks = options['tasks'] or TASKS
+        for alias in databases:
+            if options['enable_incremental_vacuum']:
+                seconds = maintenance.enable_incremental_vacuum(alias)
+                self.stdout.write(f'{alias} vacuum: {seconds:.3f}s')
+            if 'backup' in tasks:
+                result = maintenance.backup(alias)
+                self.stdout.write(
+                    f'{alias} backup: {result["seconds"]:.3f}s, '
+                    f'{result["pages"]} pages, '
+                    f'{result["restarts"]} restarts'
+                )
+            if 'optimize' in tasks:
+                for step, seconds in maintenance.optimize(alias).items():
+                    self.stdout.write(f'{alias} {step}: {seconds:.3f}s')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog import stats
+from blog.models import AuthorStats, CategoryStats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount post and comment counts and last activity of every '
+        'author and category.'
+    )
+
+    def handle(self, *args, **options):
+        for model in (AuthorStats, CategoryStats):
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: '
+                f'{stats.rebuild(model)} rows'
+            )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from blog import jobs  # noqa: F401
+from blog import scheduler
+
+
+class Command(BaseCommand):
+    help = 'Run periodic maintenance jobs of the blog.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Run only these jobs, once, and exit.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run every job once and exit.',
+        )
+        parser.add_argument(
+            '--tick',
+            type=float,
+            default=1.0,
+            help='Seconds between checks for due jobs.',
+        )
+
+    def handle(self, *args, **options):
+        if options['names'] or options['once']:
+            selected = (
+                [scheduler.get_job(name) for name in options['names']]
+                or scheduler.jobs
+            )
+            for job in selected:
+                self.stdout.write(f'{job.name}: {job.run():.3f}s')
+            return
+        self.stdout.write(
+            'Scheduled: '
+            + ', '.join(
+                f'{job.name} every {job.interval:g}s'
+                for job in scheduler.jobs
+            )
+        )
+        scheduler.run_forever(options['tick'])
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.smtpstub import ReceivedMessage, SMTPStub
+
+
+class PrintingSMTPStub(SMTPStub):
+    def __init__(self, stdout, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stdout = stdout
+
+    def received(self, message: ReceivedMessage) -> None:
+        super().received(message)
+        self.stdout.write(
+            f'{message.mail_from} -> {", ".join(message.rcpt_to)}: '
+            f'{message.message["Subject"]}'
+        )
+
+
+class Command(BaseCommand):
+    help = 'Run a local SMTP server that accepts and prints every message.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=settings.EMAIL_PORT)
+
+    def handle(self, *args, **options):
+        stub = PrintingSMTPStub(self.stdout, options['host'], options['port'])
+        self.stdout.write(f'Listening on {options["host"]}:{stub.port}')
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.server_close()
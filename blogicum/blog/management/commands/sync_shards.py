@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import shards
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy every user, category and location to the post shards, e.g. '
+        'after adding a shard or loading data with signals disabled.'
+    )
+
+    def handle(self, *args, **options):
+        if not shards.enabled():
+            raise CommandError('POST_SHARDS is not configured.')
+        self.stdout.write(
+            f'{shards.mirror_all()} rows copied to '
+            f'{", ".join(settings.POST_SHARDS)}'
+        )
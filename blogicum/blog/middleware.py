@@ -0,0 +1,35 @@
+from django.conf import settings
+
+from . import replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Set on the responses to writes; while the client sends it back, its
+# requests read from the primary and see what it wrote.
+PIN_COOKIE = 'read_primary'
+
+
+class ReplicaMiddleware:
+    """Let safe requests read from a replica (blog.routers.ReplicaRouter)
+    unless their client wrote something in the last REPLICA_PIN_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REPLICAS:
+            return self.get_response(request)
+        safe = request.method in SAFE_METHODS
+        pinned = not safe or PIN_COOKIE in request.COOKIES
+        with replicas.reading(None if pinned else replicas.choose()):
+            response = self.get_response(request)
+        if not safe:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
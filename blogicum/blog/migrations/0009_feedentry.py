@@ -0,0 +1,89 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:08
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils.text import Truncator
+import django.db.models.deletion
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = (
+        Post.objects.filter(is_published=True, category__is_published=True)
+        .select_related('author', 'category', 'location')
+        .order_by()
+    )
+    if not posts.exists():
+        return
+    # Comments may be in another database (blog.routers).
+    comment_counts = dict(
+        Comment.objects.order_by()
+        .values('post')
+        .annotate(count=Count('id'))
+        .values_list('post', 'count')
+    )
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                post_id=post.pk,
+                pub_date=post.pub_date,
+                title=post.title,
+                excerpt=Truncator(post.text).words(10),
+                image=post.image.name,
+                author_id=post.author_id,
+                author_username=post.author.username,
+                category_id=post.category_id,
+                category_title=post.category.title,
+                category_slug=post.category.slug,
+                location_name=(
+                    post.location.name
+                    if post.location and post.location.is_published
+                    else ''
+                ),
+                comment_count=comment_counts.get(post.pk, 0),
+            )
+            for post in posts.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0008_post_author_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('excerpt', models.TextField(verbose_name='Начало текста')),
+                ('image', models.ImageField(blank=True, upload_to='posts_images', verbose_name='Фото')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Имя автора')),
+                ('category_title', models.CharField(max_length=256, verbose_name='Название категории')),
+                ('category_slug', models.SlugField(verbose_name='Идентификатор категории')),
+                ('location_name', models.CharField(blank=True, max_length=256, verbose_name='Название места')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date'], name='blog_feeden_pub_dat_a5f988_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
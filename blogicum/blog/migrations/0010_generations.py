@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_locations(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    FeedEntry.objects.update(
+        location_id=Subquery(
+            Post.objects.filter(pk=OuterRef('post_id')).values(
+                'location_id'
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedentry',
+            name='location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.location', verbose_name='Местоположение'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['category', '-pub_date'], name='blog_post_categor_556717_idx'),
+        ),
+        migrations.RunPython(fill_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_comment_relations_without_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+            options={
+                'verbose_name': 'номер публикации',
+                'verbose_name_plural': 'Номера публикаций',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='post',
+            options={'base_manager_name': 'all_objects', 'default_related_name': 'posts', 'ordering': ('-pub_date',), 'verbose_name': 'публикация', 'verbose_name_plural': 'Публикации'},
+        ),
+        migrations.AlterModelManagers(
+            name='post',
+            managers=[
+                ('objects', django.db.models.manager.Manager()),
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='feedentry',
+            name='post',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация'),
+        ),
+        migrations.AlterField(
+            model_name='postranking',
+            name='post',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='blog.post', verbose_name='Публикация'),
+        ),
+    ]
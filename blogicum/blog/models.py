@@ -1,13 +1,68 @@
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, EmailMultiAlternatives
 from django.db import models
-from django.db.models import Count
+from django.template.defaultfilters import linebreaksbr
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from . import shards
+from .fast_urls import fast_reverse
 
 User = get_user_model()
 
+# Columns of a post and its author rendered by includes/post_card.html.
+# Categories and locations come from blog.reference.
+CARD_FIELDS = (
+    'title',
+    'excerpt',
+    'pub_date',
+    'image',
+    'is_published',
+    'category',
+    'location',
+    'author__username',
+)
+
+# Words of a post shown on its card.
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 512
+
+
+class HTMLField(models.TextField):
+    """HTML rendered and escaped by the model; loaded as a safe string, so
+    that templates output it as is."""
+
+    def from_db_value(self, value, expression, connection):
+        return value if value is None else mark_safe(value)
+
+
+class RenderedTextModel(models.Model):
+    """Keep `text_html`, the text as the templates display it, up to date
+    on save, so that pages do not run text filters on every render."""
+
+    text_html = HTMLField('Текст в HTML', editable=False, blank=True)
 
-class PublishedQuerySet(models.QuerySet):
+    rendered_fields = ('text_html',)
+
+    class Meta:
+        abstract = True
+
+    def render_text(self) -> None:
+        self.text_html = linebreaksbr(self.text, autoescape=True)
+
+    def save(self, *args, **kwargs):
+        if 'text' not in self.get_deferred_fields():
+            self.render_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *self.rendered_fields}
+        super().save(*args, **kwargs)
+
+
+class PublishedQuerySet(shards.ShardedQuerySet):
     def published(self):
         return self.filter(
             is_published=True,
@@ -15,10 +70,21 @@ class PublishedQuerySet(models.QuerySet):
             pub_date__lte=datetime.now(),
         )
 
-    def add_comment_count(self):
-        return self.annotate(comment_count=Count('comments')).order_by(
-            '-pub_date'
-        )
+    def for_cards(self):
+        """Load only the columns that includes/post_card.html shows."""
+        from .reference import CardIterable
+
+        queryset = self.select_related('author').only(*CARD_FIELDS)
+        queryset._iterable_class = CardIterable
+        return queryset
+
+
+class PostManager(models.Manager.from_queryset(PublishedQuerySet)):
+    """Hide posts deleted by their authors; their rows and comments are
+    removed in the background by blog.deletion."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class PublishedModel(models.Model):
@@ -71,10 +137,19 @@ class Category(PublishedModel):
             f'{self.description[:20]}|{super().__str__()}'
         )
 
+    def get_absolute_url(self) -> str:
+        return fast_reverse('blog:category_posts', self.slug)
 
-class Post(PublishedModel):
+
+class Post(RenderedTextModel, PublishedModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.CharField(
+        'Начало текста',
+        max_length=EXCERPT_MAX_LENGTH,
+        editable=False,
+        blank=True,
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -99,14 +174,48 @@ class Post(PublishedModel):
         verbose_name='Категория',
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    view_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Просмотры'
+    )
+    deleted_at = models.DateTimeField(
+        'Время удаления', null=True, blank=True, editable=False
+    )
+
+    objects = PostManager()
+    all_objects = PublishedQuerySet.as_manager()
 
-    objects = PublishedQuerySet.as_manager()
+    rendered_fields = ('text_html', 'excerpt')
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        # Related objects load their post from its shard.
+        base_manager_name = 'all_objects'
+        indexes = (
+            models.Index(fields=('author', '-pub_date')),
+            models.Index(fields=('category', '-pub_date')),
+        )
+
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            self.pk = shards.new_post_id(self.author_id)
+            if self.pk is not None and not args:
+                kwargs.setdefault('force_insert', True)
+        elif shards.enabled() and (
+            shards.alias_for(self.pk) != shards.alias_for(self.author_id)
+        ):
+            raise ValueError(
+                'A post cannot be given to an author of another shard.'
+            )
+        super().save(*args, **kwargs)
+
+    def render_text(self) -> None:
+        super().render_text()
+        self.excerpt = Truncator(
+            Truncator(self.text).words(EXCERPT_WORDS)
+        ).chars(EXCERPT_MAX_LENGTH)
 
     def __str__(self):
         return (
@@ -116,12 +225,19 @@ class Post(PublishedModel):
             f'|{super().__str__()}'
         )
 
+    def get_absolute_url(self) -> str:
+        return fast_reverse('blog:post_detail', self.pk)
+
 
-class Comment(models.Model):
+class Comment(RenderedTextModel):
+    # Comments may be stored in another database than posts and users
+    # (blog.routers), so their relations have no database constraints and
+    # blog.signals deletes them with their post or author.
     text = models.TextField('Текст комментария')
     post = models.ForeignKey(
         Post,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         verbose_name='Публикация',
     )
     created_at = models.DateTimeField(
@@ -130,7 +246,8 @@ class Comment(models.Model):
     )
     author = models.ForeignKey(
         User,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         verbose_name='Автор комментария',
     )
 
@@ -139,6 +256,7 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
         default_related_name = 'comments'
+        indexes = (models.Index(fields=('created_at',)),)
 
     def __str__(self) -> str:
         return (
@@ -146,3 +264,236 @@ class Comment(models.Model):
             f'|{self.created_at: %Y-%m-%d %H:%M:%S}'
             f'|{self.author.username[:20]}'
         )
+
+    def get_edit_url(self) -> str:
+        return fast_reverse('blog:edit_comment', self.post_id, self.pk)
+
+    def get_delete_url(self) -> str:
+        return fast_reverse('blog:delete_comment', self.post_id, self.pk)
+
+
+class QueuedEmail(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Ожидает отправки'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Не удалось отправить'
+
+    subject = models.TextField('Тема')
+    body = models.TextField('Текст письма')
+    from_email = models.CharField('Отправитель', max_length=254)
+    to = models.JSONField('Получатели', default=list)
+    cc = models.JSONField('Копия', default=list)
+    bcc = models.JSONField('Скрытая копия', default=list)
+    reply_to = models.JSONField('Ответить', default=list)
+    headers = models.JSONField('Заголовки', default=dict)
+    alternatives = models.JSONField('Альтернативы', default=list)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток отправки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('id',)
+        indexes = (models.Index(fields=('status', 'next_attempt_at')),)
+
+    def __str__(self) -> str:
+        return f'{self.subject[:20]}|{", ".join(self.to)[:40]}|{self.status}'
+
+    @classmethod
+    def from_message(cls, message: EmailMessage) -> 'QueuedEmail':
+        return cls(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            reply_to=list(message.reply_to),
+            headers=message.extra_headers,
+            alternatives=[
+                list(alternative)
+                for alternative in getattr(message, 'alternatives', ())
+            ],
+        )
+
+    def to_message(self, connection=None) -> EmailMultiAlternatives:
+        return EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            reply_to=self.reply_to,
+            headers=self.headers,
+            alternatives=[tuple(item) for item in self.alternatives],
+            connection=connection,
+        )
+
+
+class PostRanking(models.Model):
+    # Posts may be in shards of their own (blog.shards).
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        primary_key=True,
+        related_name='ranking',
+        verbose_name='Публикация',
+    )
+    score = models.FloatField('Рейтинг', default=0)
+    comment_count = models.PositiveIntegerField('Комментариев', default=0)
+    scored_at = models.DateTimeField('Рассчитано', default=timezone.now)
+
+    class Meta:
+        verbose_name = 'рейтинг публикации'
+        verbose_name_plural = 'Популярные публикации'
+        ordering = ('-score',)
+        indexes = (models.Index(fields=('-score',)),)
+
+    def __str__(self) -> str:
+        return f'{self.post_id}|{self.score:.3f}|{self.scored_at}'
+
+
+class ActivityStats(models.Model):
+    post_count = models.PositiveIntegerField('Публикаций', default=0)
+    comment_count = models.PositiveIntegerField('Комментариев', default=0)
+    last_activity_at = models.DateTimeField(
+        'Последняя активность', null=True, blank=True
+    )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self) -> str:
+        return (
+            f'{self.pk}|{self.post_count}|{self.comment_count}'
+            f'|{self.last_activity_at}'
+        )
+
+
+class AuthorStats(ActivityStats):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь',
+    )
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+
+class CategoryStats(ActivityStats):
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Категория',
+    )
+
+    class Meta:
+        verbose_name = 'статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+
+
+class FeedEntry(models.Model):
+    """A visible post with everything its card in the feed shows.
+
+    Maintained by blog.feed; rows are removed with the post, and with the
+    category, whose visibility they depend on.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        # Posts may be in shards of their own, see blog.signals.
+        db_constraint=False,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация',
+    )
+    pub_date = models.DateTimeField('Дата и время публикации')
+    title = models.CharField('Заголовок', max_length=256)
+    excerpt = models.TextField('Начало текста')
+    image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор публикации',
+    )
+    author_username = models.CharField('Имя автора', max_length=150)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Категория',
+    )
+    category_title = models.CharField('Название категории', max_length=256)
+    category_slug = models.SlugField('Идентификатор категории')
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Местоположение',
+    )
+    location_name = models.CharField(
+        'Название места', max_length=256, blank=True
+    )
+    comment_count = models.PositiveIntegerField('Комментариев', default=0)
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        ordering = ('-pub_date',)
+        indexes = (models.Index(fields=('-pub_date',)),)
+
+    def __str__(self) -> str:
+        return f'{self.title[:20]}|{self.pub_date: %Y-%m-%d %H:%M:%S}'
+
+
+class DeletedUser(models.Model):
+    """A user deleted from the admin, hidden until blog.deletion has
+    removed their comments and posts and then the user."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='deletion',
+        verbose_name='Пользователь',
+    )
+    deleted_at = models.DateTimeField('Время удаления', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'удалённый пользователь'
+        verbose_name_plural = 'Удалённые пользователи'
+
+    def __str__(self) -> str:
+        return f'{self.user_id}|{self.deleted_at: %Y-%m-%d %H:%M:%S}'
+
+
+class PostTicket(models.Model):
+    """Hands out ids of new posts that are unique across the shards of
+    blog.shards."""
+
+    class Meta:
+        verbose_name = 'номер публикации'
+        verbose_name_plural = 'Номера публикаций'
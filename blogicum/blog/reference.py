@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.query import ModelIterable
+
+from . import replicas
+from .models import Category, Location, Post
+
+# Every worker keeps all categories and locations in memory. Saving or
+# deleting one bumps a version stamp in the shared cache, and workers
+# reload their copy once they see a stamp they did not load.
+VERSION_KEY = 'reference:version'
+
+
+class Snapshot:
+    def __init__(
+        self,
+        version: Optional[int],
+        categories: Iterable[Category],
+        locations: Iterable[Location],
+    ) -> None:
+        self.version = version
+        self.categories: Dict[int, Category] = {
+            category.pk: category for category in categories
+        }
+        self.categories_by_slug: Dict[str, Category] = {
+            category.slug: category for category in self.categories.values()
+        }
+        self.locations: Dict[int, Location] = {
+            location.pk: location for location in locations
+        }
+        self.published_category_ids: Set[int] = {
+            category.pk
+            for category in self.categories.values()
+            if category.is_published
+        }
+
+    def attach(self, post: Post) -> None:
+        """Set the post's category and location without a query. Rows
+        this snapshot does not know yet are left to load lazily."""
+        for field, rows in (
+            (Post.category.field, self.categories),
+            (Post.location.field, self.locations),
+        ):
+            pk = getattr(post, field.attname)
+            if pk is None or pk in rows:
+                field.set_cached_value(post, rows.get(pk))
+
+
+class ReferenceData:
+    """Per-process cache of the Category and Location tables.
+
+    Cached rows are shared by all threads and must not be modified.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Snapshot:
+        snapshot = self._snapshot
+        now = time.monotonic()
+        interval = settings.REFERENCE_DATA_CHECK_INTERVAL
+        if snapshot is not None and now - self._checked_at < interval:
+            return snapshot
+        version = current_version()
+        if snapshot is None or snapshot.version != version:
+            with self._lock:
+                snapshot = self._snapshot
+                # A replica may not have the rows of this version yet.
+                if snapshot is None or snapshot.version != version:
+                    with replicas.primary():
+                        snapshot = self._snapshot = Snapshot(
+                            version,
+                            Category.objects.all(),
+                            Location.objects.all(),
+                        )
+        self._checked_at = now
+        return snapshot
+
+    def category_by_slug(self, slug: str) -> Optional[Category]:
+        return self.snapshot().categories_by_slug.get(slug)
+
+    def published_category_ids(self) -> Set[int]:
+        return self.snapshot().published_category_ids
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def invalidate(self) -> None:
+        # Bump again on commit: a worker that reloads in between reads the
+        # old rows under the new stamp.
+        self.clear()
+        bump_version()
+        transaction.on_commit(bump_version)
+
+
+def current_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # An evicted stamp comes back with a value never loaded before.
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version() -> None:
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+class CardIterable(ModelIterable):
+    """Yield posts with their categories and locations taken from the
+    reference cache instead of joined tables."""
+
+    def __iter__(self):
+        snapshot = reference_data.snapshot()
+        for post in super().__iter__():
+            snapshot.attach(post)
+            yield post
+
+
+reference_data = ReferenceData()
@@ -0,0 +1,85 @@
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+# Requests that may read from a replica run with the replica's alias and
+# the time its data was copied from the primary (blog.middleware). Reads
+# that fill shared caches, which other clients reuse after the next write,
+# either go to the primary or mention the copy in their cache keys.
+Replica = Tuple[str, float]
+
+_current: ContextVar[Optional[Replica]] = ContextVar(
+    'replica', default=None
+)
+
+
+def copied_key(alias: str) -> str:
+    return f'replica:{alias}:copied_at'
+
+
+def current() -> Optional[Replica]:
+    return _current.get()
+
+
+@contextmanager
+def reading(replica: Optional[Replica]) -> Iterator[None]:
+    token = _current.set(replica)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def primary() -> Iterator[None]:
+    """Read from the primary database inside the block."""
+    with reading(None):
+        yield
+
+
+def choose() -> Optional[Replica]:
+    """Pick a replica that lags at most REPLICA_MAX_LAG seconds behind the
+    primary, or None to read from the primary."""
+    if not settings.REPLICAS:
+        return None
+    copied = cache.get_many([copied_key(alias) for alias in settings.REPLICAS])
+    oldest = time.time() - settings.REPLICA_MAX_LAG
+    fresh = [
+        (alias, copied[copied_key(alias)])
+        for alias in settings.REPLICAS
+        if copied.get(copied_key(alias), 0) >= oldest
+    ]
+    return random.choice(fresh) if fresh else None
+
+
+def marker() -> str:
+    """Part of a cache key that tells entries rendered from a replica
+    apart from entries rendered from the primary or another copy."""
+    replica = current()
+    return '' if replica is None else '@{}:{:.3f}'.format(*replica)
+
+
+def copy(alias: str) -> None:
+    """Copy the primary database into the SQLite file of a replica with
+    the online backup API, standing in for replication."""
+    started = time.time()
+    source = connections['default']
+    source.ensure_connection()
+    target = sqlite3.connect(str(settings.DATABASES[alias]['NAME']))
+    try:
+        source.connection.backup(target)
+    finally:
+        target.close()
+    cache.set(copied_key(alias), started, None)
+
+
+def copy_all() -> None:
+    for alias in settings.REPLICAS:
+        copy(alias)
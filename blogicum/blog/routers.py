@@ -0,0 +1,97 @@
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+
+from . import replicas, shards
+
+# Model label or app label -> database alias. A route is used only if the
+# alias is configured in DATABASES, otherwise the rows stay in 'default'.
+ROUTES = {
+    'blog.comment': 'comments',
+    'sessions': 'sessions',
+}
+
+
+def route(app_label: str, model_name: Optional[str] = None) -> str:
+    alias = ROUTES.get(f'{app_label}.{model_name}') or ROUTES.get(app_label)
+    return alias if alias in settings.DATABASES else 'default'
+
+
+class SplitDatabaseRouter:
+    """Keep comments and sessions, the most frequent writes, in their own
+    SQLite files, so that they do not wait for the write lock of the main
+    database.
+
+    Comments refer to posts and users in another database, so the
+    relations have no database constraints; blog.signals deletes the
+    comments of deleted posts and users, and blog.comments runs the
+    queries that used to join the tables.
+    """
+
+    def db_for_read(self, model, **hints):
+        return route(model._meta.app_label, model._meta.model_name)
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == route(app_label, model_name)
+
+
+# Apps never read from a replica: a session has to be found right after the
+# login that created it.
+PRIMARY_ONLY = {'sessions'}
+
+
+class ReplicaRouter:
+    """Send reads of the tables in 'default' to the replica that
+    blog.middleware chose for the request, and everything else to the
+    routers after it.
+
+    Reads inside a transaction of the primary stay there, so that they see
+    its writes. Replicas are copies of the primary and are not migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = replicas.current()
+        if replica is None or connections['default'].in_atomic_block:
+            return None
+        app_label = model._meta.app_label
+        if app_label in PRIMARY_ONLY or (
+            route(app_label, model._meta.model_name) != 'default'
+        ):
+            return None
+        return replica[0]
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in settings.REPLICAS else None
+
+
+def is_post(instance) -> bool:
+    return (
+        instance is not None
+        and instance._meta.label_lower == 'blog.post'
+    )
+
+
+class ShardRouter:
+    """Save and reload posts in the shard of their author (blog.shards);
+    querysets of posts find their shards themselves. Shards get the whole
+    schema.
+    """
+
+    def db_for_read(self, model, instance=None, **hints):
+        if shards.enabled() and is_post(instance) and instance.pk:
+            return shards.alias_for(instance.pk)
+        return None
+
+    def db_for_write(self, model, instance=None, **hints):
+        if not shards.enabled() or not is_post(instance):
+            return None
+        return shards.alias_for(instance.pk or instance.author_id)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True if db in settings.POST_SHARDS else None
@@ -0,0 +1,64 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    func: Callable[[], None]
+    interval: float
+    next_run: float = field(default=0.0)
+
+    @property
+    def name(self) -> str:
+        return self.func.__name__
+
+    def run(self) -> float:
+        started = time.monotonic()
+        try:
+            self.func()
+        except Exception:
+            logger.exception('Job %s failed', self.name)
+        finally:
+            self.next_run = time.monotonic() + self.interval
+        return time.monotonic() - started
+
+
+jobs: List[Job] = []
+
+
+def every(**interval: float) -> Callable:
+    """Register the decorated function to run every `interval`
+    (keyword arguments of `datetime.timedelta`)."""
+    seconds = timedelta(**interval).total_seconds()
+
+    def decorator(func: Callable[[], None]) -> Callable[[], None]:
+        jobs.append(Job(func, seconds))
+        return func
+
+    return decorator
+
+
+def get_job(name: str) -> Job:
+    for job in jobs:
+        if job.name == name:
+            return job
+    raise KeyError(name)
+
+
+def run_pending() -> List[Job]:
+    now = time.monotonic()
+    due = [job for job in jobs if job.next_run <= now]
+    for job in due:
+        logger.info('Job %s took %.3fs', job.name, job.run())
+    return due
+
+
+def run_forever(tick: float = 1.0) -> None:
+    while True:
+        run_pending()
+        time.sleep(tick)
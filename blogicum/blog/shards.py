@@ -0,0 +1,298 @@
+import heapq
+from collections import Counter, defaultdict
+from functools import cmp_to_key
+from typing import Any, Callable, List, Optional, Sequence, Set
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.expressions import Col
+from django.db.models.lookups import Exact, In
+
+# Posts can be spread over several databases, POST_SHARDS, by author. A
+# post's id tells its shard as well: ids are handed out by PostTicket in
+# the main database so that `id % len(POST_SHARDS)` equals
+# `author_id % len(POST_SHARDS)`. Every shard has the whole schema and a
+# copy of the users, categories and locations (`mirror()`), so that posts
+# are still joined with them there; comments, the feed, rankings and stats
+# stay in their databases and refer to posts by id.
+SHARD_FIELDS = ('id', 'author_id')
+
+
+def enabled() -> bool:
+    return bool(settings.POST_SHARDS)
+
+
+def alias_for(key: int) -> str:
+    """Shard of an author id or of a post id."""
+    return settings.POST_SHARDS[key % len(settings.POST_SHARDS)]
+
+
+def new_post_id(author_id: int) -> Optional[int]:
+    """Allocate the id of a new post of the author, or None to let the
+    database number it when posts are not sharded."""
+    from .models import PostTicket
+
+    if not enabled():
+        return None
+    shards = len(settings.POST_SHARDS)
+    ticket = PostTicket.objects.create()
+    return ticket.pk * shards + author_id % shards
+
+
+def shard_keys(query) -> Optional[Set[str]]:
+    """Shards that the top-level conditions of a query on author or post
+    ids restrict it to, or None if it may match posts of any shard."""
+    where = query.where
+    if where.connector != 'AND' or where.negated:
+        return None
+    keys = None
+    for child in where.children:
+        if not (
+            isinstance(child, (Exact, In))
+            and isinstance(child.lhs, Col)
+            and child.lhs.alias == query.base_table
+            and child.lhs.target.attname in SHARD_FIELDS
+        ):
+            continue
+        values = [child.rhs] if isinstance(child, Exact) else child.rhs
+        if not isinstance(values, (list, tuple, set, frozenset)) or not all(
+            isinstance(value, int) for value in values
+        ):
+            continue
+        found = {alias_for(value) for value in values}
+        keys = found if keys is None else keys & found
+    return keys
+
+
+def compare(ordering: Sequence[str], key: Callable[[Any, str], Any]):
+    """Compare rows the way ORDER BY `ordering` does in SQLite, where
+    NULLs come first."""
+
+    def cmp(left, right) -> int:
+        for name in ordering:
+            descending = name.startswith('-')
+            a, b = key(left, name.lstrip('-')), key(right, name.lstrip('-'))
+            if a == b:
+                continue
+            if a is None or b is None:
+                result = -1 if a is None else 1
+            else:
+                result = -1 if a < b else 1
+            return -result if descending else result
+        return 0
+
+    return cmp_to_key(cmp)
+
+
+class ShardedQuerySet(models.QuerySet):
+    """Run a query of posts on the shards that may hold its rows: one
+    shard for the posts of an author or for posts by id, all of them
+    otherwise, merging their rows in the order of the query.
+
+    Queries bound to a database with `using()` run there only.
+    """
+
+    def _scattered(self) -> bool:
+        return enabled() and self._db is None
+
+    def _targets(self) -> List[str]:
+        keys = shard_keys(self.query)
+        return [
+            alias
+            for alias in settings.POST_SHARDS
+            if keys is None or alias in keys
+        ]
+
+    def _on(self, alias: str) -> 'ShardedQuerySet':
+        clone = self._chain()
+        clone._db = alias
+        return clone
+
+    def _ordering(self) -> Sequence[str]:
+        if self.query.order_by:
+            return self.query.order_by
+        if self.query.default_ordering:
+            return self.model._meta.ordering
+        return ()
+
+    def _row_key(self) -> Optional[Callable[[Any, str], Any]]:
+        """How to read ordering fields from the rows, if they have them."""
+        names = [name.lstrip('-') for name in self._ordering()]
+        if not all(isinstance(name, str) for name in names) or any(
+            '__' in name or name == '?' for name in names
+        ):
+            return None
+        if issubclass(self._iterable_class, models.query.ModelIterable):
+            meta = self.model._meta
+            try:
+                attnames = {
+                    name: meta.pk.attname
+                    if name == 'pk'
+                    else meta.get_field(name).attname
+                    for name in names
+                }
+            except FieldDoesNotExist:
+                return None
+            return lambda row, name: getattr(row, attnames[name])
+        if issubclass(self._iterable_class, models.query.ValuesIterable):
+            if all(name in (self._fields or ()) for name in names):
+                return lambda row, name: row[name]
+            return None
+        if self._fields and all(name in self._fields for name in names):
+            positions = {name: self._fields.index(name) for name in names}
+            if issubclass(
+                self._iterable_class, models.query.FlatValuesListIterable
+            ):
+                return lambda row, name: row
+            return lambda row, name: row[positions[name]]
+        return None
+
+    def _gather(self) -> list:
+        targets = self._targets()
+        if len(targets) == 1:
+            return list(self._on(targets[0]))
+        low, high = self.query.low_mark, self.query.high_mark
+        results = []
+        for alias in targets:
+            clone = self._on(alias)
+            clone._prefetch_related_lookups = ()
+            clone.query.clear_limits()
+            # Every shard may hold all the rows up to the end of a slice.
+            clone.query.set_limits(high=high)
+            results.append(list(clone))
+        key = self._row_key()
+        if key is None:
+            rows = [row for result in results for row in result]
+        else:
+            rows = list(
+                heapq.merge(*results, key=compare(self._ordering(), key))
+            )
+        return rows[low:high]
+
+    def _fetch_all(self):
+        if self._result_cache is None and self._scattered():
+            self._result_cache = self._gather()
+        super()._fetch_all()
+
+    def iterator(self, chunk_size=2000):
+        if self._scattered():
+            return iter(self._gather())
+        return super().iterator(chunk_size)
+
+    def count(self) -> int:
+        if self._result_cache is not None or not self._scattered():
+            return super().count()
+        if self.query.is_sliced or self.query.distinct:
+            return len(self._gather())
+        return sum(self._on(alias).count() for alias in self._targets())
+
+    def exists(self) -> bool:
+        if self._result_cache is not None or not self._scattered():
+            return super().exists()
+        return any(self._on(alias).exists() for alias in self._targets())
+
+    def update(self, **kwargs) -> int:
+        if not self._scattered():
+            return super().update(**kwargs)
+        return sum(
+            self._on(alias).update(**kwargs) for alias in self._targets()
+        )
+
+    def delete(self):
+        if not self._scattered():
+            return super().delete()
+        deleted, rows = 0, Counter()
+        for alias in self._targets():
+            count, per_model = self._on(alias).delete()
+            deleted += count
+            rows.update(per_model)
+        return deleted, dict(rows)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if not self._scattered():
+            return super().bulk_create(objs, *args, **kwargs)
+        objs = list(objs)
+        by_alias = defaultdict(list)
+        for obj in objs:
+            if obj.pk is None:
+                obj.pk = new_post_id(obj.author_id)
+            by_alias[alias_for(obj.pk)].append(obj)
+        for alias, shard_objs in by_alias.items():
+            self._on(alias).bulk_create(shard_objs, *args, **kwargs)
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        if not self._scattered():
+            return super().bulk_update(objs, fields, batch_size)
+        by_alias = defaultdict(list)
+        for obj in objs:
+            by_alias[alias_for(obj.pk)].append(obj)
+        for alias, shard_objs in by_alias.items():
+            self._on(alias).bulk_update(shard_objs, fields, batch_size)
+
+    def aggregate(self, *args, **kwargs):
+        targets = self._targets() if self._scattered() else ()
+        if len(targets) > 1:
+            raise NotImplementedError(
+                'Aggregates over the posts of several shards are not '
+                'supported; group by a key and add the rows up instead.'
+            )
+        if targets:
+            return self._on(targets[0]).aggregate(*args, **kwargs)
+        return super().aggregate(*args, **kwargs)
+
+
+def mirrored_models() -> List[type]:
+    from .models import Category, Location, User
+
+    return [User, Category, Location]
+
+
+def mirror(instance: models.Model, update_fields=None) -> None:
+    """Write a user, category or location saved in the main database to
+    every shard."""
+    model = type(instance)
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+        and (update_fields is None or field.name in update_fields)
+    ]
+    values = {
+        field.attname: getattr(instance, field.attname) for field in fields
+    }
+    for alias in settings.POST_SHARDS:
+        rows = model._base_manager.using(alias).filter(pk=instance.pk)
+        if not rows.update(**values) and update_fields is None:
+            rows.bulk_create([model(pk=instance.pk, **values)])
+
+
+def unmirror(instance: models.Model) -> None:
+    """Delete a user, category or location from every shard, along with
+    the posts that cascade from it there."""
+    for alias in settings.POST_SHARDS:
+        type(instance)._base_manager.using(alias).filter(
+            pk=instance.pk
+        ).delete()
+
+
+def mirror_all(batch_size: int = 500) -> int:
+    """Copy every user, category and location to every shard."""
+    copied = 0
+    for model in mirrored_models():
+        rows = list(model._base_manager.using('default').order_by('pk'))
+        fields = [
+            field.name
+            for field in model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        for alias in settings.POST_SHARDS:
+            manager = model._base_manager.using(alias)
+            manager.bulk_create(
+                rows, batch_size=batch_size, ignore_conflicts=True
+            )
+            if rows and fields:
+                manager.bulk_update(rows, fields, batch_size=batch_size)
+        copied += len(rows)
+    return copied
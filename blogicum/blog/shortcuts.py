@@ -0,0 +1,56 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from . import replicas
+from .models import Post, User
+
+# Model -> lookup that identifies a row in a URL. Misses are remembered
+# per value of this lookup and forgotten whenever a row is saved.
+NEGATIVE_LOOKUP_FIELDS = {
+    Post: 'pk',
+    User: 'username',
+}
+
+
+def missing_key(model: type, value: Any) -> str:
+    return f'missing:{model._meta.label_lower}:{value}'
+
+
+def get_object_or_404_cached(klass, **kwargs) -> models.Model:
+    """Like `get_object_or_404`, but remember misses for
+    NEGATIVE_LOOKUP_TTL seconds so that repeated probes for rows that do
+    not exist cost a cache hit instead of a query.
+
+    Extra lookups besides the identifying one must only depend on the row
+    itself (e.g. `is_published`), as saving the row clears the miss.
+    """
+    model = getattr(klass, 'model', klass)
+    key = missing_key(model, kwargs[NEGATIVE_LOOKUP_FIELDS[model]])
+    if cache.get(key):
+        raise Http404(
+            f'No {model._meta.object_name} matches the given query.'
+        )
+    try:
+        return get_object_or_404(klass, **kwargs)
+    except Http404:
+        if replicas.current() is None:
+            cache.set(key, True, settings.NEGATIVE_LOOKUP_TTL)
+            raise
+    # The row may be too new for the replica; only the primary can tell
+    # that it is missing.
+    with replicas.primary():
+        return get_object_or_404_cached(klass, **kwargs)
+
+
+def forget_missing(instance: models.Model) -> None:
+    model = type(instance)
+    key = missing_key(
+        model, getattr(instance, NEGATIVE_LOOKUP_FIELDS[model])
+    )
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
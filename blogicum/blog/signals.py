@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import feed, generations, shards, stats, timelines
+from .models import (
+    Category,
+    Comment,
+    FeedEntry,
+    Location,
+    Post,
+    PostRanking,
+    User,
+)
+from .reference import reference_data
+from .shortcuts import forget_missing
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=User)
+def forget_missing_on_save(sender, instance, **kwargs):
+    forget_missing(instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, raw=False, **kwargs):
+    instance._stats_previous = (
+        None
+        if raw or instance._state.adding
+        else Post.objects.filter(pk=instance.pk)
+        .values('is_published', 'category_id')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.post_saved(instance, instance._stats_previous)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    # Posts purged by blog.deletion were uncounted when they were hidden.
+    if instance.deleted_at is None:
+        stats.post_deleted(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def delete_post_comments(sender, instance, **kwargs):
+    # Posts purged by blog.deletion have no comments left.
+    if instance.deleted_at is None:
+        Comment.objects.filter(post=instance).delete()
+
+
+@receiver(pre_delete, sender=User)
+def delete_author_comments(sender, instance, **kwargs):
+    Comment.objects.filter(author=instance).delete()
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.comment_saved(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    stats.comment_deleted(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def refresh_author_timeline(sender, instance, raw=False, **kwargs):
+    if not raw and instance.deleted_at is None:
+        timelines.refresh(instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def refresh_feed_entry(sender, instance, raw=False, **kwargs):
+    if not raw:
+        feed.refresh([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_feed(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        feed.category_changed(instance)
+
+
+@receiver(post_save, sender=Location)
+def refresh_location_feed(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        feed.location_changed(instance)
+
+
+@receiver(pre_delete, sender=Location)
+def clear_location_feed(sender, instance, **kwargs):
+    # Posts lose the location through an UPDATE that sends no signals.
+    FeedEntry.objects.filter(location=instance).update(location_name='')
+
+
+@receiver(post_save, sender=User)
+def refresh_author_feed(sender, instance, created, raw=False,
+                        update_fields=None, **kwargs):
+    # Logins save only last_login; only the username is shown in the feed.
+    if created or raw or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    feed.author_changed(instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_feed_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        feed.add_comments(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_feed_comment(sender, instance, **kwargs):
+    feed.add_comments(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_generations(sender, instance, raw=False, **kwargs):
+    generations.bump('post', instance.pk)
+    generations.bump('category', instance.category_id)
+    previous = getattr(instance, '_stats_previous', None)
+    if previous and previous['category_id'] != instance.category_id:
+        generations.bump('category', previous['category_id'])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_generation(sender, instance, **kwargs):
+    generations.bump('category', instance.pk)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def bump_location_generation(sender, instance, **kwargs):
+    generations.bump('location', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_reference_data(sender, **kwargs):
+    reference_data.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def mirror_to_shards(sender, instance, using, update_fields=None, **kwargs):
+    if shards.enabled() and using not in settings.POST_SHARDS:
+        shards.mirror(instance, update_fields)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def unmirror_from_shards(sender, instance, using, **kwargs):
+    if shards.enabled() and using not in settings.POST_SHARDS:
+        shards.unmirror(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_rows_elsewhere(sender, instance, using, **kwargs):
+    # A post deleted in its shard takes only the rows of that shard along.
+    if using in settings.POST_SHARDS:
+        FeedEntry.objects.filter(pk=instance.pk).delete()
+        PostRanking.objects.filter(pk=instance.pk).delete()
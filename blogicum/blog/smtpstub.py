@@ -0,0 +1,101 @@
+"""Minimal SMTP server that keeps received messages in memory.
+
+Usable as a local stand-in for a real mail server in tests and during
+development::
+
+    with SMTPStub() as stub:
+        ...  # send to 127.0.0.1:stub.port
+    stub.messages[0].message['Subject']
+"""
+import email
+import email.policy
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import List
+
+
+@dataclass
+class ReceivedMessage:
+    mail_from: str
+    rcpt_to: List[str]
+    data: bytes = field(repr=False)
+
+    @property
+    def message(self) -> Message:
+        return email.message_from_bytes(
+            self.data, policy=email.policy.default
+        )
+
+
+def parse_address(argument: str) -> str:
+    # 'FROM:<user@example.com> SIZE=100' -> 'user@example.com'
+    return argument.partition(':')[2].strip().split(' ')[0].strip('<>')
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def read_data(self) -> bytes:
+        lines = []
+        for line in self.rfile:
+            if line in (b'.\r\n', b'.\n'):
+                break
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        return b''.join(lines)
+
+    def handle(self) -> None:
+        mail_from, rcpt_to = '', []
+        self.reply('220 blogicum SMTP stub')
+        for raw in self.rfile:
+            command, _, argument = raw.decode().rstrip('\r\n').partition(' ')
+            command = command.upper()
+            if command in ('HELO', 'EHLO'):
+                self.reply('250 blogicum')
+            elif command == 'MAIL':
+                mail_from, rcpt_to = parse_address(argument), []
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                rcpt_to.append(parse_address(argument))
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.server.received(
+                    ReceivedMessage(mail_from, rcpt_to, self.read_data())
+                )
+                self.reply('250 OK')
+            elif command in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), SMTPHandler)
+        self.messages: List[ReceivedMessage] = []
+        self._lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def received(self, message: ReceivedMessage) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+    def __enter__(self) -> 'SMTPStub':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
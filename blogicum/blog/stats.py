@@ -0,0 +1,182 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Type
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from . import comments
+from .models import (
+    ActivityStats,
+    AuthorStats,
+    Category,
+    CategoryStats,
+    Comment,
+    Post,
+    User,
+)
+
+# Stats model -> (parent model, lookup from Post). Posts are counted while
+# published; comments are counted by their author for authors and by the
+# category of their post for categories. Deleted posts and users are not
+# counted while blog.deletion purges them.
+SOURCES = {
+    AuthorStats: (User, 'author'),
+    CategoryStats: (Category, 'category'),
+}
+
+
+def grouped(queryset, key: str) -> Dict[int, dict]:
+    result = {}
+    # Sharded posts (blog.shards) give a row per key from every shard.
+    for row in (
+        queryset.order_by()
+        .values(key)
+        .annotate(count=Count('id'), last=Max('created_at'))
+    ):
+        total = result.setdefault(row[key], {'count': 0, 'last': None})
+        total['count'] += row['count']
+        total['last'] = max(
+            filter(None, (total['last'], row['last'])), default=None
+        )
+    return result
+
+
+def comment_activity(
+    model: Type[ActivityStats], ids: List[int]
+) -> Dict[int, dict]:
+    if model is AuthorStats:
+        by_author = comments.activity('author', ids)
+        return {
+            pk: {'count': count, 'last': last}
+            for pk, (count, last) in by_author.items()
+        }
+    # Comments may be in another database than posts: they are counted
+    # per post and added up per category here.
+    post_categories = dict(
+        Post.objects.filter(category__in=ids).values_list('pk', 'category')
+    )
+    result = {}
+    for post_id, (count, last) in comments.activity(
+        'post', post_categories
+    ).items():
+        row = result.setdefault(
+            post_categories[post_id], {'count': 0, 'last': None}
+        )
+        row['count'] += count
+        row['last'] = max(filter(None, (row['last'], last)), default=None)
+    return result
+
+
+def rebuild(
+    model: Type[ActivityStats], ids: Optional[Iterable[int]] = None
+) -> int:
+    """Recount the stats of the given authors or categories, or of all of
+    them, from the posts and comments tables."""
+    parent, post_key = SOURCES[model]
+    parents = parent.objects.all()
+    if ids is not None:
+        parents = parents.filter(pk__in=list(ids))
+    ids = list(parents.values_list('pk', flat=True))
+    posts = grouped(
+        Post.objects.filter(
+            **{f'{post_key}__in': ids}, is_published=True
+        ),
+        post_key,
+    )
+    comment_rows = comment_activity(model, ids)
+    empty = {'count': 0, 'last': None}
+    rows = []
+    for pk in ids:
+        post_row, comment_row = (
+            posts.get(pk, empty), comment_rows.get(pk, empty)
+        )
+        rows.append(
+            model(
+                pk=pk,
+                post_count=post_row['count'],
+                comment_count=comment_row['count'],
+                last_activity_at=max(
+                    filter(None, (post_row['last'], comment_row['last'])),
+                    default=None,
+                ),
+            )
+        )
+    # Comments are written in their own transaction, possibly in another
+    # database, so two first comments may rebuild the same row at once.
+    with transaction.atomic():
+        model.objects.filter(pk__in=ids).delete()
+        model.objects.bulk_create(rows)
+    return len(rows)
+
+
+def bump(
+    model: Type[ActivityStats],
+    pk: Optional[int],
+    posts: int = 0,
+    comments: int = 0,
+    activity: Optional[datetime] = None,
+) -> None:
+    """Apply a change to the stats row of an author or category in a
+    single UPDATE. A missing row is recounted when something is added and
+    left to `manage.py repair_stats` otherwise."""
+    if pk is None or not (posts or comments):
+        return
+    changes = {
+        'post_count': F('post_count') + posts,
+        'comment_count': F('comment_count') + comments,
+    }
+    if activity is not None:
+        changes['last_activity_at'] = Greatest(
+            Coalesce('last_activity_at', Value(activity)), Value(activity)
+        )
+    if model.objects.filter(pk=pk).update(**changes) or (
+        posts < 0 or comments < 0
+    ):
+        return
+    rebuild(model, [pk])
+
+
+def post_saved(post: Post, previous: Optional[dict]) -> None:
+    published = int(post.is_published)
+    if previous is None:
+        activity = post.created_at if published else None
+        bump(AuthorStats, post.author_id, published, activity=activity)
+        bump(CategoryStats, post.category_id, published, activity=activity)
+        return
+    was_published = int(previous['is_published'])
+    bump(AuthorStats, post.author_id, published - was_published)
+    if previous['category_id'] == post.category_id:
+        bump(CategoryStats, post.category_id, published - was_published)
+        return
+    comments = post.comments.count()
+    bump(CategoryStats, previous['category_id'], -was_published, -comments)
+    bump(CategoryStats, post.category_id, published, comments)
+
+
+def post_deleted(post: Post) -> None:
+    # Comments of the post are deleted, and counted down, before it.
+    bump(AuthorStats, post.author_id, -int(post.is_published))
+    bump(CategoryStats, post.category_id, -int(post.is_published))
+
+
+def comment_saved(comment: Comment) -> None:
+    bump(AuthorStats, comment.author_id, comments=1,
+         activity=comment.created_at)
+    bump(CategoryStats, comment_category_id(comment), comments=1,
+         activity=comment.created_at)
+
+
+def comment_deleted(comment: Comment) -> None:
+    bump(AuthorStats, comment.author_id, comments=-1)
+    bump(CategoryStats, comment_category_id(comment), comments=-1)
+
+
+def comment_category_id(comment: Comment) -> Optional[int]:
+    if Comment.post.is_cached(comment):
+        return comment.post.category_id
+    return (
+        Post.objects.filter(pk=comment.post_id)
+        .values_list('category_id', flat=True)
+        .first()
+    )
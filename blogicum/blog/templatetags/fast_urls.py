@@ -0,0 +1,12 @@
+from django import template
+
+from blog.fast_urls import fast_reverse
+
+register = template.Library()
+
+
+@register.simple_tag
+def fast_url(viewname: str, *args, **kwargs) -> str:
+    """{% url %} for pages rendered many times per response; the result
+    is the same, see blog.fast_urls."""
+    return fast_reverse(viewname, *args, **kwargs)
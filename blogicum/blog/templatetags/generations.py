@@ -0,0 +1,15 @@
+from django import template
+
+from blog import generations
+from blog.models import Post
+
+register = template.Library()
+
+
+@register.simple_tag
+def card_stamp(post: Post) -> str:
+    return generations.stamp(
+        ('post', post.pk),
+        ('category', post.category_id),
+        ('location', post.location_id),
+    )
@@ -0,0 +1,19 @@
+from typing import Iterator, Union
+
+from django import template
+from django.core.paginator import Page
+
+register = template.Library()
+
+# Links shown around the current page and at either end of the range.
+ON_EACH_SIDE = 2
+ON_ENDS = 1
+
+
+@register.simple_tag
+def elided_page_range(page: Page) -> Iterator[Union[int, str]]:
+    """Page numbers to link to, with `Paginator.ELLIPSIS` in the gaps, so
+    that the number of links does not grow with the number of pages."""
+    return page.paginator.get_elided_page_range(
+        page.number, on_each_side=ON_EACH_SIDE, on_ends=ON_ENDS
+    )
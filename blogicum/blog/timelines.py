@@ -0,0 +1,91 @@
+import time
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import generations, replicas
+from .models import Post
+from .reference import reference_data
+
+# (post id, publication timestamp, is_published, category id), newest first.
+Entry = Tuple[int, float, bool, Optional[int]]
+
+
+def timeline_key(author_id: int) -> str:
+    return f'timeline:author:{author_id}'
+
+
+def build(author_id: int) -> List[Entry]:
+    # The list is cached until the author's next write, so it is read
+    # from the primary.
+    with replicas.primary():
+        entries = [
+            (pk, pub_date.timestamp(), is_published, category_id)
+            for pk, pub_date, is_published, category_id in (
+                Post.objects.filter(author_id=author_id)
+                .order_by('-pub_date', '-pk')
+                .values_list('pk', 'pub_date', 'is_published', 'category_id')
+            )
+        ]
+    cache.set(timeline_key(author_id), entries, settings.TIMELINE_TTL)
+    return entries
+
+
+def entries(author_id: int) -> List[Entry]:
+    cached = cache.get(timeline_key(author_id))
+    return build(author_id) if cached is None else cached
+
+
+def post_ids(author_id: int, published_only: bool) -> List[int]:
+    """Return the ids of the author's posts, newest first, keeping only
+    the ones visible to other users if `published_only` is set.
+
+    Publication time and category are checked here rather than when the
+    timeline is built, so that scheduled posts appear and unpublished
+    categories disappear without touching the timelines.
+    """
+    if not published_only:
+        return [pk for pk, *_ in entries(author_id)]
+    now = time.time()
+    published_categories = reference_data.published_category_ids()
+    return [
+        pk
+        for pk, timestamp, is_published, category_id in entries(author_id)
+        if is_published
+        and timestamp <= now
+        and category_id in published_categories
+    ]
+
+
+def refresh(author_id: int) -> None:
+    # Readers fall back to the database until the change is committed,
+    # then the timeline is rebuilt from committed rows.
+    cache.delete(timeline_key(author_id))
+    transaction.on_commit(lambda: build(author_id))
+
+
+def category_post_ids(category_id: int) -> List[int]:
+    """Return the ids of the published posts of a published category,
+    newest first.
+
+    The list is cached under the category's generation, which saving the
+    category or any of its posts bumps.
+    """
+    key = 'timeline:category:{}:{}'.format(
+        category_id, generations.stamp(('category', category_id))
+    )
+    entries = cache.get(key)
+    if entries is None:
+        entries = [
+            (pk, pub_date.timestamp())
+            for pk, pub_date in Post.objects.filter(
+                category_id=category_id, is_published=True
+            )
+            .order_by('-pub_date', '-pk')
+            .values_list('pk', 'pub_date')
+        ]
+        cache.set(key, entries, settings.TIMELINE_TTL)
+    now = time.time()
+    return [pk for pk, timestamp in entries if timestamp <= now]
@@ -0,0 +1,122 @@
+import math
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from . import comments
+from .models import Comment, Post, PostRanking
+
+
+def decay(age: timedelta) -> float:
+    return 0.5 ** (age.total_seconds() / settings.TRENDING_HALF_LIFE)
+
+
+def horizon() -> timedelta:
+    """Age after which a single comment weighs less than the minimum
+    score, or the whole window if that is shorter."""
+    return min(
+        timedelta(
+            seconds=settings.TRENDING_HALF_LIFE
+            * math.log2(1 / settings.TRENDING_MIN_SCORE)
+        ),
+        timedelta(seconds=settings.TRENDING_WINDOW),
+    )
+
+
+@transaction.atomic
+def update_rankings(now: Optional[datetime] = None) -> int:
+    """Decay the stored scores and add comments posted since the last run.
+
+    An empty table is rebuilt from the comments of the last `horizon()`.
+    Returns the number of posts with new comments.
+    """
+    now = now or timezone.now()
+    rankings = PostRanking.objects.all()
+    since = rankings.aggregate(Max('scored_at'))['scored_at__max'] or (
+        now - horizon()
+    )
+    rankings.update(score=F('score') * decay(now - since), scored_at=now)
+    new_comments = list(
+        Comment.objects.filter(
+            created_at__gt=since, created_at__lte=now
+        ).values_list('post_id', 'created_at')
+    )
+    # Comments may be in another database than posts (blog.routers).
+    ranked_posts = set()
+    for batch in comments.batches({post_id for post_id, _ in new_comments}):
+        ranked_posts.update(
+            Post.objects.filter(
+                pk__in=batch,
+                pub_date__gte=now
+                - timedelta(seconds=settings.TRENDING_WINDOW),
+            ).values_list('pk', flat=True)
+        )
+    activity = Counter()
+    for post_id, created_at in new_comments:
+        if post_id in ranked_posts:
+            activity[post_id] += decay(now - created_at)
+    existing = rankings.in_bulk(activity)
+    for post_id, ranking in existing.items():
+        ranking.score += activity[post_id]
+    PostRanking.objects.bulk_update(existing.values(), ['score'])
+    PostRanking.objects.bulk_create(
+        PostRanking(post_id=post_id, score=score, scored_at=now)
+        for post_id, score in activity.items()
+        if post_id not in existing
+    )
+    rankings.filter(score__lt=settings.TRENDING_MIN_SCORE).delete()
+    # Posts may be in other databases (blog.shards).
+    for batch in comments.batches(rankings.values_list('pk', flat=True)):
+        old_posts = Post.all_objects.filter(
+            pk__in=batch,
+            pub_date__lt=now - timedelta(seconds=settings.TRENDING_WINDOW),
+        ).values_list('pk', flat=True)
+        PostRanking.objects.filter(pk__in=list(old_posts)).delete()
+    update_comment_counts()
+    return len(activity)
+
+
+def update_comment_counts() -> None:
+    # Counted for every ranked post, so that deleted comments are
+    # accounted for as well.
+    rankings = list(PostRanking.objects.only('comment_count'))
+    counts = comments.counts(ranking.pk for ranking in rankings)
+    changed = []
+    for ranking in rankings:
+        count = counts.get(ranking.pk, 0)
+        if ranking.comment_count != count:
+            ranking.comment_count = count
+            changed.append(ranking)
+    PostRanking.objects.bulk_update(changed, ['comment_count'])
+
+
+def visible_post_ids() -> List[int]:
+    """Ids of the ranked posts that are visible, best first."""
+    ranked = list(PostRanking.objects.values_list('pk', flat=True))
+    visible = set()
+    for batch in comments.batches(ranked):
+        visible.update(
+            Post.objects.published()
+            .filter(pk__in=batch)
+            .values_list('pk', flat=True)
+        )
+    return [pk for pk in ranked if pk in visible]
+
+
+def cards(post_ids: List[int]) -> List[Post]:
+    """Posts for the cards of a page of `visible_post_ids()`, with the
+    comment counts of their rankings."""
+    posts = Post.objects.for_cards().in_bulk(post_ids)
+    counts = dict(
+        PostRanking.objects.filter(pk__in=post_ids).values_list(
+            'pk', 'comment_count'
+        )
+    )
+    for post in posts.values():
+        post.comment_count = counts.get(post.pk, 0)
+    return [posts[pk] for pk in post_ids if pk in posts]
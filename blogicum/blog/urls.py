@@ -1,23 +1,32 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = 'blog'
 
+# Read-only pages are served by coroutine views under ASGI.
+read_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
     path(
         '',
-        views.IndexListView.as_view(),
+        read_views.IndexListView.as_view(),
         name='index'
     ),
+    path(
+        'trending/',
+        read_views.TrendingListView.as_view(),
+        name='trending',
+    ),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryListView.as_view(),
+        read_views.CategoryListView.as_view(),
         name='category_posts',
     ),
     path(
         'posts/<int:post_id>/',
-        views.PostDetailView.as_view(),
+        read_views.PostDetailView.as_view(),
         name='post_detail',
     ),
     path(
@@ -57,7 +66,7 @@ urlpatterns = [
     ),
     path(
         'profile/<slug:username>/',
-        views.ProfileDetailView.as_view(),
+        read_views.ProfileDetailView.as_view(),
         name='profile',
     ),
 ]
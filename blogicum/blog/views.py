@@ -2,10 +2,12 @@ from typing import Any
 
 from django import http
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import F
 from django.db.models.query import QuerySet
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -14,8 +16,19 @@ from django.views.generic import (
     UpdateView,
 )
 
+from . import comments, deletion, feed, shards, timelines, trending
+from .counters import post_views
 from .forms import CommentForm, PostForm, UserUpdateForm
-from .models import Category, Comment, Post, User
+from .models import (
+    Category,
+    CategoryStats,
+    Comment,
+    FeedEntry,
+    Post,
+    User,
+)
+from .reference import reference_data
+from .shortcuts import get_object_or_404_cached
 
 NUM_POST_PER_PAGE = 10
 
@@ -24,34 +37,87 @@ class IndexListView(ListView):
     model = Post
     paginate_by = NUM_POST_PER_PAGE
     template_name = 'blog/index.html'
-    queryset = (
-        Post.objects.published()
-        .add_comment_count()
-        .select_related('location', 'category', 'author')
-    )
 
+    def get_queryset(self) -> QuerySet[Any]:
+        # blog.FeedEntry holds only visible posts, with the fields their
+        # cards show.
+        return FeedEntry.objects.filter(pub_date__lte=timezone.now())
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, _, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        page.object_list = feed.as_posts(page.object_list)
+        return paginator, page, page.object_list, is_paginated
+
+
+class TrendingListView(ListView):
+    model = Post
+    paginate_by = NUM_POST_PER_PAGE
+    template_name = 'blog/trending.html'
+
+    def get_queryset(self) -> QuerySet[Any]:
+        # Scores and comment counts are kept in blog.PostRanking by the
+        # `rank_trending_posts` job.
+        if shards.enabled():
+            # Rankings cannot be joined with posts in the shards.
+            return trending.visible_post_ids()
+        return (
+            Post.objects.published()
+            .filter(ranking__isnull=False)
+            .annotate(comment_count=F('ranking__comment_count'))
+            .for_cards()
+            .order_by('-ranking__score')
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, _, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        if shards.enabled():
+            page.object_list = trending.cards(page.object_list)
+        return paginator, page, page.object_list, is_paginated
+
+
+class PostIdsPaginationMixin:
+    """Paginate a list of post ids and fetch only the posts of the
+    current page."""
 
-class CategoryListView(ListView):
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, _, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        posts = Post.objects.for_cards().in_bulk(page.object_list)
+        page.object_list = comments.add_counts(
+            [posts[pk] for pk in page.object_list if pk in posts]
+        )
+        return paginator, page, page.object_list, is_paginated
+
+
+class CategoryListView(PostIdsPaginationMixin, ListView):
     model = Post
     paginate_by = NUM_POST_PER_PAGE
     template_name = 'blog/category.html'
 
     def get_category(self) -> Category:
-        return get_object_or_404(
-            Category, slug=self.kwargs['category_slug'], is_published=True
+        category = reference_data.category_by_slug(
+            self.kwargs['category_slug']
         )
+        if category is None or not category.is_published:
+            raise http.Http404('No Category matches the given query.')
+        return category
 
-    def get_queryset(self) -> QuerySet[Any]:
-        return (
-            self.get_category()
-            .posts.published()
-            .add_comment_count()
-            .select_related('location', 'category', 'author')
-        )
+    def get_queryset(self) -> list[int]:
+        return timelines.category_post_ids(self.get_category().pk)
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        category = self.get_category()
         return dict(
-            **super().get_context_data(**kwargs), category=self.get_category()
+            **super().get_context_data(**kwargs),
+            category=category,
+            category_stats=CategoryStats.objects.filter(
+                pk=category.pk
+            ).first(),
         )
 
 
@@ -67,7 +133,7 @@ class PostCheckAuthorMixin(LoginRequiredMixin, PostFormMixin):
     def dispatch(
         self, request: http.HttpRequest, *args: Any, **kwargs: Any
     ) -> http.HttpResponse:
-        post = get_object_or_404(Post, pk=kwargs['post_id'])
+        post = get_object_or_404_cached(Post, pk=kwargs['post_id'])
         if post.author != request.user:
             return redirect('blog:post_detail', post_id=post.pk)
         return super().dispatch(request, *args, **kwargs)
@@ -78,22 +144,26 @@ class PostDetailView(PostFormMixin, DetailView):
     pk_url_kwarg = 'post_id'
 
     def get_object(self) -> Post:
-        post = get_object_or_404(
+        post = get_object_or_404_cached(
             Post,
             pk=self.kwargs['post_id'],
         )
-        if post.author == self.request.user:
-            return post
-        return get_object_or_404(
-            Post.objects.published(),
-            pk=self.kwargs['post_id'],
-        )
+        if post.author != self.request.user:
+            # From the database that had the post, which for a new post
+            # may be the primary rather than the replica of the request.
+            post = get_object_or_404(
+                Post.objects.published().using(post._state.db),
+                pk=self.kwargs['post_id'],
+            )
+        reference_data.snapshot().attach(post)
+        post_views.hit(post.pk)
+        return post
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         return dict(
             **super().get_context_data(**kwargs),
             form=CommentForm(),
-            comments=self.object.comments.select_related('author'),
+            comments=comments.for_post(self.object),
         )
 
 
@@ -116,6 +186,12 @@ class PostUpdateView(PostCheckAuthorMixin, UpdateView):
 class PostDeleteView(PostCheckAuthorMixin, DeleteView):
     success_url = reverse_lazy('blog:index')
 
+    def delete(self, request, *args, **kwargs):
+        # Comments are removed later by the `purge_deleted` job.
+        self.object = self.get_object()
+        deletion.delete_post(self.object)
+        return redirect(self.get_success_url())
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         return dict(
             **super().get_context_data(**kwargs),
@@ -168,7 +244,7 @@ class CommentDeleteView(CommentUpdDelMixin, DeleteView):
     pass
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(PostIdsPaginationMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = NUM_POST_PER_PAGE
@@ -176,17 +252,22 @@ class ProfileDetailView(ListView):
     slug_url_kwarg = 'username'
 
     def get_profile(self) -> User:
-        return get_object_or_404(User, username=self.kwargs['username'])
-
-    def get_queryset(self) -> QuerySet[Any]:
-        qs = (
-            self.get_profile()
-            .posts.add_comment_count()
-            .select_related('location', 'category', 'author')
+        if not hasattr(self, 'profile'):
+            self.profile = get_object_or_404_cached(
+                User.objects.filter(deletion__isnull=True).select_related(
+                    'stats'
+                ),
+                username=self.kwargs['username'],
+            )
+        return self.profile
+
+    def get_queryset(self) -> list[int]:
+        # Pages are sliced from the author's cached timeline, and only the
+        # posts of the current page are fetched.
+        profile = self.get_profile()
+        return timelines.post_ids(
+            profile.pk, published_only=profile != self.request.user
         )
-        if self.get_profile() != self.request.user:
-            return qs.published()
-        return qs
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         return dict(
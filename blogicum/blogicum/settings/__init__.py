@@ -0,0 +1,14 @@
+"""
+Settings are selected with the DJANGO_ENV environment variable:
+'dev' (default) for local development and 'prod' for deployment.
+
+Run `manage.py check --deploy --tag performance` to list configuration
+known to hurt throughput.
+"""
+
+import os
+
+if os.getenv('DJANGO_ENV', 'dev') == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
@@ -0,0 +1,356 @@
+"""
+Django settings for blogicum project shared by all environments.
+
+Generated by 'django-admin startproject' using Django 3.2.16.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/3.2/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = (
+    'django-insecure-l2+5=3!i!vy3#s&gi+e)aklhs$$j^pir2@gjq07e%d-q1jew=^'
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    'www.berg.pythonanywhere.com',
+    'berg.pythonanywhere.com',
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'pages.apps.PagesConfig',
+    'blog.apps.BlogConfig',
+    'django_bootstrap5',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.ReplicaMiddleware',
+    'pages.middleware.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# Compile every template at worker start (see `manage.py warm_templates`).
+WARM_TEMPLATES = False
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+# Serve the read-only blog pages with coroutine views
+# (blog.async_views); enabled by default by blogicum.asgi.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS') == '1'
+
+
+# Database
+# https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+# Comments and sessions are written far more often than anything else and
+# can be kept in SQLite files of their own, e.g.
+# COMMENTS_DATABASE=comments.sqlite3, so that their writes do not wait for
+# the lock of the main file. Create the tables with
+# `manage.py migrate --database=comments` (and `--database=sessions`).
+for alias, variable in (
+    ('comments', 'COMMENTS_DATABASE'),
+    ('sessions', 'SESSIONS_DATABASE'),
+):
+    if os.getenv(variable):
+        DATABASES[alias] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / os.environ[variable],
+        }
+
+# Read replicas, e.g. REPLICA_DATABASES=replica1.sqlite3,replica2.sqlite3.
+# Locally they are copies of the main file that the `copy_replicas` job
+# refreshes every REPLICA_COPY_INTERVAL seconds. Safe requests read from a
+# replica that lags at most REPLICA_MAX_LAG seconds behind, unless their
+# client wrote something in the last REPLICA_PIN_SECONDS (blog.middleware).
+REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('REPLICA_DATABASES', '').split(',')), start=1
+):
+    REPLICAS.append(f'replica{number}')
+    DATABASES[REPLICAS[-1]] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / name,
+        'TEST': {'MIRROR': 'default'},
+    }
+REPLICA_COPY_INTERVAL = 5
+REPLICA_MAX_LAG = 30
+REPLICA_PIN_SECONDS = 60
+
+# Posts can be spread over SQLite files by author, e.g.
+# POST_SHARDS=posts1.sqlite3,posts2.sqlite3 (blog.shards). Each shard needs
+# `manage.py migrate --database=posts1` and a copy of the users, categories
+# and locations (`manage.py sync_shards`), which signals keep up to date.
+# Posts already in the main database are not moved to the shards.
+POST_SHARDS = []
+for number, name in enumerate(
+    filter(None, os.getenv('POST_SHARDS', '').split(',')), start=1
+):
+    POST_SHARDS.append(f'posts{number}')
+    DATABASES[POST_SHARDS[-1]] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / name,
+    }
+
+DATABASE_ROUTERS = [
+    'blog.routers.ShardRouter',
+    'blog.routers.ReplicaRouter',
+    'blog.routers.SplitDatabaseRouter',
+]
+
+# Online backups of every SQLite database but the replicas go to
+# BACKUP_DIR every BACKUP_INTERVAL seconds, BACKUP_PAGES pages at a time
+# with BACKUP_PAUSE seconds for writers in between (blog.maintenance); the
+# BACKUP_KEEP latest ones of each are kept. The
+# planner statistics are refreshed and free pages given back every
+# OPTIMIZE_INTERVAL seconds. `manage.py maintain_db` does both at once.
+BACKUP_DIR = Path(os.getenv('BACKUP_DIR', BASE_DIR / 'backups'))
+BACKUP_INTERVAL = 60 * 60
+BACKUP_KEEP = 24
+BACKUP_PAGES = 256
+BACKUP_PAUSE = 0.01
+OPTIMIZE_INTERVAL = 6 * 60 * 60
+ANALYZE_LIMIT = 1000
+VACUUM_PAGES = 1000
+
+
+# Response compression (pages.middleware.CompressionMiddleware).
+# Brotli is used when the optional `brotli` package is installed.
+# URL_NAMES maps a view name such as 'blog:post_detail' to False to never
+# compress its responses, or to a dict overriding the options above it.
+# `manage.py bench_compression` shows the CPU-versus-bytes tradeoff.
+
+COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
+    'EXCLUDED_CONTENT_TYPES': (
+        'image/',
+        'video/',
+        'audio/',
+        'font/woff',
+        'application/gzip',
+        'application/zip',
+        'application/pdf',
+    ),
+    'URL_NAMES': {},
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/3.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/3.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+
+STATIC_ROOT = BASE_DIR / 'static_collected'
+
+# The prod profile fingerprints and pre-compresses collected files and lets
+# Django serve them from STATIC_ROOT (pages.staticfiles.serve).
+SERVE_STATIC = False
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Cache-backed sessions need a cache shared by all worker processes,
+# e.g. CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# with CACHE_LOCATION pointing to a directory.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'blogicum'),
+    }
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/3.2/topics/http/sessions/
+# SESSION_STRATEGY selects the engine: 'db' reads the session table on every
+# authenticated request, 'cached_db' reads it only on a cache miss, 'cache'
+# never touches the database and 'signed_cookies' keeps no server state.
+# Expired rows are removed by the `clear_expired_sessions` job (runjobs).
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_STRATEGY', 'db')]
+
+SESSION_CLEANUP_BATCH_SIZE = 1000
+
+# Seconds to remember that a post id or username does not exist, so that
+# crawlers probing random URLs are answered from the cache. Category slugs
+# are looked up in blog.reference.
+NEGATIVE_LOOKUP_TTL = 60
+
+# Profile and category pages page through cached lists of post ids
+# (blog.timelines). Author lists are rebuilt whenever one of their posts is
+# saved or deleted, category lists are keyed by the category's generation.
+TIMELINE_TTL = 24 * 60 * 60
+
+# The index feed is read from blog.FeedEntry, kept up to date by signals
+# and fully rewritten by the `rebuild_feed` job.
+FEED_REBUILD_INTERVAL = 60 * 60
+FEED_REFRESH_BATCH_SIZE = 500
+
+# Categories and locations are cached in every worker (blog.reference),
+# which checks the shared version stamp at most this often, in seconds.
+REFERENCE_DATA_CHECK_INTERVAL = 1
+
+# Deleted posts and users are hidden at once; their rows and comments are
+# removed by the `purge_deleted` job, PURGE_BATCH_SIZE rows per transaction.
+PURGE_INTERVAL = 60
+PURGE_BATCH_SIZE = 1000
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+# Built by `manage.py prerender_pages`; pages fall back to regular rendering
+# while the directory is empty.
+PRERENDERED_PAGES_DIR = BASE_DIR / 'prerendered'
+
+# Outgoing mail is stored in the database and delivered in batches by the
+# `deliver_queued_email` job (runjobs) through EMAIL_QUEUE_DELIVERY_BACKEND.
+# For local SMTP testing run `manage.py smtpstub` and set
+# EMAIL_QUEUE_DELIVERY_BACKEND=django.core.mail.backends.smtp.EmailBackend.
+EMAIL_BACKEND = 'blog.mail.QueuedEmailBackend'
+EMAIL_QUEUE_DELIVERY_BACKEND = os.getenv(
+    'EMAIL_QUEUE_DELIVERY_BACKEND',
+    'django.core.mail.backends.filebased.EmailBackend',
+)
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 25))
+EMAIL_QUEUE_INTERVAL = 5
+EMAIL_QUEUE_BATCH_SIZE = 50
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_DELAY = 60
+EMAIL_QUEUE_MAX_RETRY_DELAY = 60 * 60
+
+# Post views are counted in worker memory and written with one UPDATE per
+# flush; a crashed worker loses at most this many seconds of views.
+VIEW_COUNT_FLUSH_INTERVAL = 10
+VIEW_COUNT_FLUSH_BATCH_SIZE = 300
+
+# The trending feed is read from blog.PostRanking, which the
+# `rank_trending_posts` job updates from new comments. A comment's weight
+# halves every TRENDING_HALF_LIFE seconds; posts older than TRENDING_WINDOW
+# seconds or below TRENDING_MIN_SCORE drop out.
+TRENDING_INTERVAL = 5 * 60
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_WINDOW = 7 * 24 * 60 * 60
+TRENDING_MIN_SCORE = 0.01
+
+LOGIN_URL = 'login'
+LOGIN_REDIRECT_URL = 'blog:index'
+
+MEDIA_ROOT = BASE_DIR / 'media'
@@ -0,0 +1,24 @@
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, SECRET_KEY, TEMPLATE_LOADERS, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.getenv('SECRET_KEY', SECRET_KEY)
+
+# Keep compiled templates in memory for the lifetime of a worker.
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+]
+
+WARM_TEMPLATES = True
+
+# Reuse database connections between requests.
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = 60
+
+# `manage.py collectstatic` writes fingerprinted files with .gz and .br
+# siblings (.br requires the optional `brotli` package).
+STATICFILES_STORAGE = 'pages.staticfiles.CompressedManifestStaticFilesStorage'
+SERVE_STATIC = True
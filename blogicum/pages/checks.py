@@ -0,0 +1,127 @@
+from django.conf import settings
+from django.core.checks import Info, Warning, register
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+CACHE_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+SYNCHRONOUS_EMAIL_BACKENDS = (
+    'django.core.mail.backends.filebased.EmailBackend',
+    'django.core.mail.backends.smtp.EmailBackend',
+)
+
+
+def performance_check(func):
+    """Register a check of configuration known to hurt throughput in
+    production; run them with `manage.py check --deploy --tag performance`.
+    """
+    return register('performance', deploy=True)(func)
+
+
+@performance_check
+def check_debug(app_configs, **kwargs):
+    errors = []
+    if settings.DEBUG:
+        errors.append(
+            Warning(
+                'DEBUG is on.',
+                hint=(
+                    'Every SQL query is kept in connection.queries and '
+                    'templates are not cached. Set DJANGO_ENV=prod.'
+                ),
+                id='pages.W001',
+            )
+        )
+    if 'debug_toolbar' in settings.INSTALLED_APPS or any(
+        'debug_toolbar' in middleware for middleware in settings.MIDDLEWARE
+    ):
+        errors.append(
+            Warning(
+                'django-debug-toolbar is installed.',
+                hint='Its middleware runs on every request.',
+                id='pages.W002',
+            )
+        )
+    return errors
+
+
+@performance_check
+def check_templates(app_configs, **kwargs):
+    errors = [
+        Warning(
+            f'Templates of the {backend.name!r} engine are not cached.',
+            hint='Templates are re-read and re-parsed on each use.',
+            id='pages.W003',
+        )
+        for backend in engines.all()
+        if isinstance(backend, DjangoTemplates)
+        and not any(
+            isinstance(loader, CachedLoader)
+            for loader in backend.engine.template_loaders
+        )
+    ]
+    if not settings.WARM_TEMPLATES:
+        errors.append(
+            Info(
+                'Templates are not compiled at worker start.',
+                hint='First requests after a deploy pay parse costs.',
+                id='pages.I001',
+            )
+        )
+    return errors
+
+
+@performance_check
+def check_sessions(app_configs, **kwargs):
+    if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.db':
+        return [
+            Info(
+                'Sessions are read from the database on every request.',
+                hint='Set SESSION_STRATEGY to cached_db or signed_cookies.',
+                id='pages.I002',
+            )
+        ]
+    cache_backend = settings.CACHES['default']['BACKEND']
+    if settings.SESSION_ENGINE in CACHE_SESSION_ENGINES and (
+        cache_backend.endswith('LocMemCache')
+    ):
+        return [
+            Warning(
+                'Cache-backed sessions use a per-process cache.',
+                hint=(
+                    "Workers do not see each other's session changes. "
+                    'Configure a shared CACHE_BACKEND.'
+                ),
+                id='pages.W004',
+            )
+        ]
+    return []
+
+
+@performance_check
+def check_email(app_configs, **kwargs):
+    if settings.EMAIL_BACKEND in SYNCHRONOUS_EMAIL_BACKENDS:
+        return [
+            Warning(
+                'Email is sent on the request thread.',
+                hint="Use EMAIL_BACKEND = 'blog.mail.QueuedEmailBackend'.",
+                id='pages.W005',
+            )
+        ]
+    return []
+
+
+@performance_check
+def check_database(app_configs, **kwargs):
+    if not settings.DATABASES['default'].get('CONN_MAX_AGE'):
+        return [
+            Info(
+                'A new database connection is opened for every request.',
+                hint='Set CONN_MAX_AGE.',
+                id='pages.I003',
+            )
+        ]
+    return []
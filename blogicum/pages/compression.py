@@ -0,0 +1,66 @@
+import gzip
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available.
+    brotli = None
+
+
+def gzip_compress(data: bytes, level: int) -> bytes:
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        # Flush after every chunk so that the client receives it right away.
+        data = compressor.compress(chunk) + compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def brotli_compress(data: bytes, quality: int) -> bytes:
+    return brotli.compress(data, quality=quality)
+
+
+def brotli_stream(chunks: Iterable[bytes], quality: int) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+Codec = Tuple[
+    Callable[[bytes, int], bytes],
+    Callable[[Iterable[bytes], int], Iterator[bytes]],
+]
+
+# Content coding -> (compress, stream), in order of preference.
+CODECS: Dict[str, Codec] = {'gzip': (gzip_compress, gzip_stream)}
+if brotli is not None:
+    CODECS = {'br': (brotli_compress, brotli_stream), **CODECS}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Return the preferred supported coding of an Accept-Encoding header."""
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        try:
+            weight = float(params.strip().partition('q=')[2] or 1)
+        except ValueError:
+            weight = 0
+        weights[coding.strip().lower()] = weight
+    best, best_weight = None, 0
+    for coding in CODECS:
+        weight = weights.get(coding, weights.get('*', 0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
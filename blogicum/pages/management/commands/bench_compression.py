@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from blog.benchmark import (
+    create_sample_content,
+    make_client,
+    production_like,
+    rolled_back,
+    summary,
+    timings,
+)
+from pages.compression import CODECS
+
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 4, 6, 11)}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare compression time and size of rendered feed, category, '
+        'post and about pages for every coding and level.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=30)
+        parser.add_argument('--comments', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with production_like(), rolled_back():
+            post = create_sample_content(
+                options['posts'], options['comments']
+            )
+            client = make_client()
+            pages = {
+                'index': reverse('blog:index'),
+                'category': reverse(
+                    'blog:category_posts', args=[post.category.slug]
+                ),
+                'detail': reverse('blog:post_detail', args=[post.id]),
+                'about': reverse('pages:about'),
+            }
+            contents = {
+                name: client.get(url).content for name, url in pages.items()
+            }
+        self.stdout.write(
+            f'{"page":<10}{"coding":<8}{"level":>6}{"bytes":>10}'
+            f'{"ratio":>8}{"mean ms":>10}{"MB/s":>8}'
+        )
+        for name, content in contents.items():
+            self.stdout.write(
+                f'{name:<10}{"none":<8}{"":>6}{len(content):>10}'
+            )
+            for coding, (compress, _) in CODECS.items():
+                for level in LEVELS[coding]:
+                    compressed = compress(content, level)
+                    mean = summary(
+                        timings(
+                            lambda: compress(content, level),
+                            options['repeat'],
+                        )
+                    )['mean_ms']
+                    self.stdout.write(
+                        f'{"":<10}{coding:<8}{level:>6}{len(compressed):>10}'
+                        f'{len(content) / len(compressed):>8.1f}'
+                        f'{mean:>10.2f}'
+                        f'{len(content) / mean / 1000:>8.0f}'
+                    )
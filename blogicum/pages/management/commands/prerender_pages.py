@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from pages import prerender
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-render the static and error pages into PRERENDERED_PAGES_DIR. '
+        'Run after collectstatic and restart the workers afterwards.'
+    )
+
+    def handle(self, *args, **options):
+        for name, size in prerender.build().items():
+            self.stdout.write(f'{name}: {size} bytes')
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from blog.benchmark import make_client, production_like, timings
+from pages.warmup import cached_loaders, reset, warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile every template under TEMPLATES_DIR and compare first-request '
+        'latency with cold and warmed template caches.'
+    )
+
+    def handle(self, *args, **options):
+        reset()
+        compiled = warm_templates()
+        if options['verbosity'] > 1:
+            for name, seconds in compiled.items():
+                self.stdout.write(f'{name}: {seconds * 1000:.2f} ms')
+        self.stdout.write(
+            f'Compiled {len(compiled)} templates in '
+            f'{sum(compiled.values()) * 1000:.1f} ms'
+        )
+        if not cached_loaders():
+            self.stderr.write(
+                'The cached template loader is disabled, set DJANGO_ENV=prod '
+                'to measure first requests.'
+            )
+            return
+        client = make_client()
+        with production_like():
+            for url in (reverse('blog:index'), reverse('pages:about')):
+                client.get(url)
+                reset()
+                cold = timings(lambda: client.get(url), 1)[0]
+                reset()
+                warm_templates()
+                warm = timings(lambda: client.get(url), 1)[0]
+                self.stdout.write(
+                    f'{url}: first request {cold * 1000:.1f} ms cold, '
+                    f'{warm * 1000:.1f} ms warm'
+                )
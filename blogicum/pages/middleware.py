@@ -0,0 +1,66 @@
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import CODECS, negotiate
+
+LEVEL_OPTIONS = {'br': 'BROTLI_QUALITY', 'gzip': 'GZIP_LEVEL'}
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses with Brotli or gzip, whichever the client
+    prefers, following settings.COMPRESSION.
+
+    Streaming responses are compressed chunk by chunk; other responses
+    only if they are at least MIN_SIZE bytes long.
+    """
+
+    def get_options(self, request) -> Optional[Dict[str, Any]]:
+        options = settings.COMPRESSION
+        match = getattr(request, 'resolver_match', None)
+        override = options['URL_NAMES'].get(match.view_name) if match else {}
+        if override is False:
+            return None
+        return {**options, **(override or {})}
+
+    def is_compressible(self, response, options: Dict[str, Any]) -> bool:
+        if response.has_header('Content-Encoding') or (
+            response.status_code == 206
+        ):
+            return False
+        if response.get('Content-Type', '').startswith(
+            tuple(options['EXCLUDED_CONTENT_TYPES'])
+        ):
+            return False
+        return response.streaming or (
+            len(response.content) >= options['MIN_SIZE']
+        )
+
+    def process_response(self, request, response):
+        options = self.get_options(request)
+        if options is None or not self.is_compressible(response, options):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+        compress, stream = CODECS[coding]
+        level = options[LEVEL_OPTIONS[coding]]
+        if response.streaming:
+            response.streaming_content = stream(
+                response.streaming_content, level
+            )
+            del response['Content-Length']
+        else:
+            compressed = compress(response.content, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = coding
+        return response
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.html import escape
+
+HEADER_AUTH_TEMPLATE = 'includes/header_auth.html'
+HEADER_AUTH_PLACEHOLDER = '<!--prerendered:header-auth-->'
+REQUEST_URI_PLACEHOLDER = '__prerendered_request_uri__'
+
+# Page name -> (template, URL name or None for error pages).
+PAGES = {
+    'about': ('pages/about.html', 'pages:about'),
+    'rules': ('pages/rules.html', 'pages:rules'),
+    '404': ('pages/404.html', None),
+    '500': ('pages/500.html', None),
+    '403csrf': ('pages/403csrf.html', None),
+}
+
+
+def render_page(name: str) -> str:
+    """Render the anonymous version of a page with placeholders in place
+    of the request-dependent fragments."""
+    template_name, url_name = PAGES[name]
+    path = reverse(url_name) if url_name else f'/prerendered/{name}/'
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path) if url_name else None
+    request.build_absolute_uri = lambda location=None: REQUEST_URI_PLACEHOLDER
+    content = render_to_string(template_name, request=request)
+    header_auth = render_to_string(HEADER_AUTH_TEMPLATE, request=request)
+    return content.replace(header_auth, HEADER_AUTH_PLACEHOLDER, 1)
+
+
+def build() -> Dict[str, int]:
+    directory = settings.PRERENDERED_PAGES_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for name in PAGES:
+        content = render_page(name).encode()
+        (directory / f'{name}.html').write_bytes(content)
+        sizes[name] = len(content)
+    load.cache_clear()
+    return sizes
+
+
+@lru_cache(maxsize=None)
+def load(name: str) -> Optional[str]:
+    try:
+        return (settings.PRERENDERED_PAGES_DIR / f'{name}.html').read_text()
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def anonymous_header_auth() -> str:
+    return render_to_string(
+        HEADER_AUTH_TEMPLATE, {'user': AnonymousUser()}
+    )
+
+
+def header_auth(request: HttpRequest) -> str:
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return anonymous_header_auth()
+    return render_to_string(HEADER_AUTH_TEMPLATE, {'user': user})
+
+
+def response(
+    request: HttpRequest, name: str, status: int = 200
+) -> Optional[HttpResponse]:
+    """Serve a page built by `manage.py prerender_pages`, or return None
+    if it has not been built."""
+    content = load(name)
+    if content is None:
+        return None
+    content = content.replace(HEADER_AUTH_PLACEHOLDER, header_auth(request))
+    if REQUEST_URI_PLACEHOLDER in content:
+        content = content.replace(
+            REQUEST_URI_PLACEHOLDER, escape(request.build_absolute_uri())
+        )
+    return HttpResponse(content, status=status)
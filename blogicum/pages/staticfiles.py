@@ -0,0 +1,103 @@
+import mimetypes
+import posixpath
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import CODECS
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.ico', '.txt', '.json')
+COMPRESS_MIN_SIZE = 256
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MUTABLE_CACHE_CONTROL = 'public, max-age=60'
+# Content coding -> (file suffix, strongest compression level).
+ENCODINGS = {'br': ('.br', 11), 'gzip': ('.gz', 9)}
+
+
+def compress(path: Path) -> None:
+    """Write .gz and .br siblings of a file if they are smaller."""
+    content = path.read_bytes()
+    if len(content) < COMPRESS_MIN_SIZE:
+        return
+    for coding, (compress_content, _) in CODECS.items():
+        suffix, level = ENCODINGS[coding]
+        compressed = compress_content(content, level)
+        if len(compressed) < len(content):
+            path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Fingerprint file names and pre-compress the fingerprinted files
+    with gzip and, if installed, Brotli at collectstatic time."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                compress(Path(self.path(hashed_name)))
+
+
+@lru_cache(maxsize=None)
+def hashed_names() -> Set[str]:
+    manifest = getattr(staticfiles_storage, 'hashed_files', {})
+    return set(manifest.values())
+
+
+def accepted_encodings(request) -> Set[str]:
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    return {coding.split(';')[0].strip() for coding in header.split(',')}
+
+
+def find_variant(request, fullpath: Path) -> Tuple[Path, Optional[str]]:
+    accepted = accepted_encodings(request)
+    for encoding, (suffix, _) in ENCODINGS.items():
+        variant = fullpath.with_name(fullpath.name + suffix)
+        if encoding in accepted and variant.exists():
+            return variant, encoding
+    return fullpath, None
+
+
+def serve(request, path):
+    """Serve collected static files with their pre-compressed siblings.
+
+    Fingerprinted files never change, so browsers may cache them forever.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404(f'"{path}" does not exist')
+    statobj = fullpath.stat()
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        statobj.st_mtime,
+        statobj.st_size,
+    ):
+        return HttpResponseNotModified()
+    variant, encoding = find_variant(request, fullpath)
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    response = FileResponse(
+        variant.open('rb'),
+        content_type=content_type or 'application/octet-stream',
+    )
+    response.headers['Last-Modified'] = http_date(statobj.st_mtime)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = (
+        IMMUTABLE_CACHE_CONTROL
+        if path in hashed_names()
+        else MUTABLE_CACHE_CONTROL
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
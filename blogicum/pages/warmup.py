@@ -0,0 +1,41 @@
+import time
+from typing import Dict, List
+
+from django.conf import settings
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loader import get_template
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def template_names() -> List[str]:
+    root = settings.TEMPLATES_DIR
+    return sorted(
+        path.relative_to(root).as_posix() for path in root.rglob('*.html')
+    )
+
+
+def cached_loaders() -> List[CachedLoader]:
+    return [
+        loader
+        for backend in engines.all()
+        if isinstance(backend, DjangoTemplates)
+        for loader in backend.engine.template_loaders
+        if isinstance(loader, CachedLoader)
+    ]
+
+
+def reset() -> None:
+    for loader in cached_loaders():
+        loader.reset()
+
+
+def warm_templates() -> Dict[str, float]:
+    """Compile every project template into the cached loader and return
+    the compile time of each."""
+    timings = {}
+    for name in template_names():
+        started = time.perf_counter()
+        get_template(name)
+        timings[name] = time.perf_counter() - started
+    return timings
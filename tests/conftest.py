@@ -41,6 +41,29 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def discard_post_views():
+    from blog.counters import post_views
+
+    with override_settings(VIEW_COUNT_FLUSH_INTERVAL=0):
+        yield
+    post_views.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached timelines and feeds outlive the rolled back rows they list.
+    from django.core.cache import cache
+
+    from blog.reference import reference_data
+
+    cache.clear()
+    reference_data.clear()
+    yield
+    cache.clear()
+    reference_data.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
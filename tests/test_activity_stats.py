@@ -0,0 +1,63 @@
+import pytest
+
+from blog import stats
+from blog.models import AuthorStats, CategoryStats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def current(model, pk):
+    row = model.objects.get(pk=pk)
+    return row.post_count, row.comment_count, row.last_activity_at
+
+
+def recounted(model, pk):
+    stats.rebuild(model, [pk])
+    return current(model, pk)
+
+
+def assert_consistent(post):
+    for model, pk in (
+        (AuthorStats, post.author_id),
+        (CategoryStats, post.category_id),
+    ):
+        maintained = current(model, pk)
+        assert maintained == recounted(model, pk), (
+            "Убедитесь, что статистика автора и категории обновляется при "
+            "изменении публикаций и комментариев."
+        )
+
+
+def test_stats_follow_changes(mixer, user, another_category,
+                              post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    assert current(CategoryStats, post.category_id)[:2] == (1, 3)
+    assert_consistent(post)
+
+    post.is_published = False
+    post.save()
+    assert_consistent(post)
+
+    old_category = post.category
+    post.category = another_category
+    post.is_published = True
+    post.save()
+    assert current(CategoryStats, old_category.id)[:2] == (0, 0)
+    assert_consistent(post)
+
+    post.comments.first().delete()
+    assert_consistent(post)
+    post.delete()
+    assert current(CategoryStats, another_category.id)[:2] == (0, 0)
+
+
+def test_profile_reads_stats_with_profile(
+        client, django_assert_num_queries, post_with_published_location
+):
+    author = post_with_published_location.author
+    response = client.get(f"/profile/{author.username}/")
+    profile = response.context["profile"]
+    with django_assert_num_queries(0):
+        assert profile.stats.post_count == 1
+    assert "Публикаций: 1" in response.content.decode()
@@ -0,0 +1,51 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory
+
+from blog import async_views
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def call(view_class, path, **kwargs):
+    view = view_class.as_view()
+    assert asyncio.iscoroutinefunction(view), (
+        f"Убедитесь, что `{view_class.__name__}` является асинхронным "
+        "представлением."
+    )
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return async_to_sync(view)(request, **kwargs)
+
+
+def test_async_detail_view(post_with_published_location):
+    post = post_with_published_location
+    response = call(
+        async_views.PostDetailView, f"/posts/{post.id}/", post_id=post.id
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert post.title in response.content.decode(), (
+        "Убедитесь, что асинхронная страница поста возвращает "
+        "отрисованный шаблон."
+    )
+
+
+def test_async_index_view(many_posts_with_published_locations):
+    response = call(async_views.IndexListView, "/")
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context_data["page_obj"]) == 10
+
+
+def test_async_views_raise_404(mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    with pytest.raises(Http404):
+        call(
+            async_views.CategoryListView,
+            f"/category/{category.slug}/",
+            category_slug=category.slug,
+        )
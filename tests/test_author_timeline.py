@@ -0,0 +1,30 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_profile_pages_served_from_timeline(
+        client, django_assert_num_queries, mixer, user,
+        many_posts_with_published_locations,
+):
+    url = f"/profile/{user.username}/"
+    first = client.get(url)
+    # Profile with stats, the posts of the page and their comment counts;
+    # published categories come from the in-process reference cache.
+    with django_assert_num_queries(3):
+        second = client.get(url)
+    assert list(first.context["page_obj"]) == list(
+        second.context["page_obj"]
+    )
+
+    newest = first.context["page_obj"][0]
+    newest.is_published = False
+    newest.save()
+    response = client.get(url)
+    assert newest not in response.context["page_obj"], (
+        "Убедитесь, что снятая с публикации запись пропадает из ленты "
+        "автора."
+    )
+    assert response.context["paginator"].count == (
+        first.context["paginator"].count - 1
+    )
@@ -0,0 +1,47 @@
+import gzip
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from pages.middleware import CompressionMiddleware
+
+BODY = "Публикация ".encode() * 500
+
+
+def process(response, accept_encoding="gzip", **compression):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    with override_settings(
+        COMPRESSION={**settings.COMPRESSION, **compression}
+    ):
+        return CompressionMiddleware(lambda r: response)(request)
+
+
+def test_compresses_large_responses():
+    response = process(HttpResponse(BODY))
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == BODY
+    assert "Accept-Encoding" in response["Vary"]
+
+
+def test_skips_small_and_binary_responses():
+    assert not process(HttpResponse(b"x" * 100)).has_header(
+        "Content-Encoding"
+    ), "Убедитесь, что короткие ответы не сжимаются."
+    assert not process(
+        HttpResponse(BODY, content_type="image/png")
+    ).has_header("Content-Encoding")
+    assert not process(HttpResponse(BODY), accept_encoding="").has_header(
+        "Content-Encoding"
+    )
+
+
+def test_compresses_streaming_responses_incrementally():
+    chunks = [BODY[:1000], BODY[1000:]]
+    response = process(StreamingHttpResponse(iter(chunks)))
+    assert response["Content-Encoding"] == "gzip"
+    compressed = list(response.streaming_content)
+    assert len(compressed) > 1, (
+        "Убедитесь, что потоковые ответы сжимаются по частям."
+    )
+    assert gzip.decompress(b"".join(compressed)) == BODY
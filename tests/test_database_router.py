@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.test.utils import override_settings
+
+from blog.models import Comment, Post
+from blog.routers import SplitDatabaseRouter
+
+router = SplitDatabaseRouter()
+
+SPLIT_DATABASES = {
+    **settings.DATABASES,
+    'comments': {**settings.DATABASES['default'], 'NAME': 'comments'},
+    'sessions': {**settings.DATABASES['default'], 'NAME': 'sessions'},
+}
+
+
+def test_everything_stays_in_default_without_extra_databases():
+    for model in (Comment, Post, Session):
+        assert router.db_for_write(model) == 'default'
+        assert router.db_for_read(model) == 'default'
+    assert router.allow_migrate('default', 'blog', 'comment')
+    assert router.allow_migrate('default', 'sessions', 'session')
+
+
+@override_settings(DATABASES=SPLIT_DATABASES)
+def test_comments_and_sessions_are_routed_to_their_databases():
+    assert router.db_for_write(Comment) == 'comments', (
+        "Убедитесь, что комментарии записываются в базу `comments`, "
+        "если она настроена."
+    )
+    assert router.db_for_read(Comment) == 'comments'
+    assert router.db_for_write(Session) == 'sessions'
+    assert router.db_for_write(Post) == 'default'
+    assert router.allow_relation(Comment(), Post())
+
+
+@override_settings(DATABASES=SPLIT_DATABASES)
+def test_each_table_is_migrated_in_one_database():
+    assert router.allow_migrate('comments', 'blog', 'comment')
+    assert not router.allow_migrate('default', 'blog', 'comment')
+    assert not router.allow_migrate('comments', 'blog', 'post')
+    assert router.allow_migrate('default', 'blog', 'post')
+    assert router.allow_migrate('sessions', 'sessions', 'session')
+    assert not router.allow_migrate('default', 'sessions', 'session')
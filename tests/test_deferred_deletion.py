@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import deletion
+from blog.models import AuthorStats, Comment, FeedEntry, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_deleted_post_hidden_then_purged_in_batches(
+        user_client, another_user, mixer, settings,
+        post_with_published_location,
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, author=another_user)
+    assert user_client.post(f"/posts/{post.id}/delete/").status_code == (
+        HTTPStatus.FOUND
+    )
+    assert Comment.objects.filter(post=post).count() == 5, (
+        "Комментарии удаляются в фоне, а не во время запроса."
+    )
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert not FeedEntry.objects.filter(pk=post.pk).exists()
+    assert user_client.get(f"/posts/{post.id}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert AuthorStats.objects.get(pk=another_user.pk).comment_count == 0
+
+    settings.PURGE_BATCH_SIZE = 2
+    with CaptureQueriesContext(connection) as queries:
+        assert deletion.purge() == 6
+    deletes = [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('DELETE FROM "blog_comment"')
+    ]
+    assert len(deletes) == 3, (
+        "Убедитесь, что комментарии удаляются пакетами по "
+        "PURGE_BATCH_SIZE."
+    )
+    assert not Post.all_objects.filter(pk=post.pk).exists()
+
+
+def test_deleted_user_hidden_then_purged(
+        client, user, another_user, mixer, post_with_published_location,
+):
+    post = post_with_published_location
+    own_post = mixer.blend(
+        "blog.Post", author=another_user, category=post.category,
+        is_published=True,
+    )
+    comment = mixer.blend("blog.Comment", post=post, author=another_user)
+    mixer.blend("blog.Comment", post=own_post, author=user)
+    deletion.delete_users([another_user])
+
+    assert client.get(f"/profile/{another_user.username}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    content = client.get(f"/posts/{post.id}/").content.decode()
+    assert comment.text not in content
+    assert not Post.objects.filter(pk=own_post.pk).exists()
+    assert AuthorStats.objects.get(pk=user.pk).comment_count == 0
+
+    assert deletion.purge() == 4
+    assert not User.objects.filter(pk=another_user.pk).exists()
+    assert Post.objects.filter(pk=post.pk).exists()
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 0
@@ -0,0 +1,35 @@
+import pytest
+from django.core.cache import cache
+from django.db.models import Model
+
+from blog.trending import update_rankings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feeds_load_only_card_fields(
+        user_client, another_user_client, mixer, user,
+        many_posts_with_published_locations,
+):
+    post = many_posts_with_published_locations[0]
+    mixer.blend("blog.Comment", post=post)
+    update_rankings()
+    urls = [
+        "/",
+        "/trending/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+    ]
+    with pytest.MonkeyPatch.context() as patch:
+        def refresh_from_db(self, using=None, fields=None):
+            raise AssertionError(
+                f"Поле {fields} модели {type(self).__name__} не загружено "
+                "запросом ленты. Добавьте его в `CARD_FIELDS`."
+            )
+
+        patch.setattr(Model, "refresh_from_db", refresh_from_db)
+        for client in (user_client, another_user_client):
+            for url in urls:
+                # Cards cached by another page would hide a lazy load.
+                cache.clear()
+                assert client.get(url).status_code == 200
@@ -0,0 +1,85 @@
+import pytest
+from django.template import engines
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+
+from blog.fast_urls import fast_reverse
+
+CASES = [
+    ("blog:index", ()),
+    ("blog:trending", ()),
+    ("blog:category_posts", ("travel",)),
+    ("blog:post_detail", (5,)),
+    ("blog:post_detail", ("5",)),
+    ("blog:edit_comment", (5, 12)),
+    ("blog:delete_comment", (5, 12)),
+    ("blog:profile", ("some_user",)),
+    ("blog:edit_profile", ()),
+    ("login", ()),
+    ("pages:about", ()),
+]
+
+
+@pytest.fixture
+def script_prefix():
+    yield set_script_prefix
+    set_script_prefix("/")
+
+
+@pytest.mark.parametrize("prefix", ["/", "/blog 100%/"])
+@pytest.mark.parametrize("viewname,args", CASES)
+def test_same_as_reverse(script_prefix, prefix, viewname, args):
+    script_prefix(prefix)
+    assert fast_reverse(viewname, *args) == reverse(viewname, args=args)
+
+
+def test_same_as_reverse_with_kwargs():
+    kwargs = {"post_id": 5, "comment_id": 12}
+    assert fast_reverse("blog:edit_comment", **kwargs) == reverse(
+        "blog:edit_comment", kwargs=kwargs
+    )
+
+
+@pytest.mark.parametrize(
+    "viewname,args",
+    [
+        ("blog:profile", ("user@example.com",)),
+        ("blog:post_detail", ("five",)),
+        ("blog:post_detail", ()),
+        ("blog:missing", ()),
+    ],
+)
+def test_raises_like_reverse(viewname, args):
+    with pytest.raises(NoReverseMatch):
+        reverse(viewname, args=args)
+    with pytest.raises(NoReverseMatch):
+        fast_reverse(viewname, *args)
+
+
+def test_template_tag_same_as_url_tag():
+    template = engines["django"].from_string(
+        "{% load fast_urls %}"
+        "{% url 'blog:edit_comment' post_id comment_id %}|"
+        "{% fast_url 'blog:edit_comment' post_id comment_id %}"
+    )
+    url, fast_url = template.render({"post_id": 5, "comment_id": 12}).split(
+        "|"
+    )
+    assert url == fast_url
+
+
+@pytest.mark.django_db
+def test_model_urls(mixer):
+    comment = mixer.blend("blog.Comment")
+    post = comment.post
+    assert post.get_absolute_url() == reverse(
+        "blog:post_detail", args=[post.id]
+    )
+    assert post.category.get_absolute_url() == reverse(
+        "blog:category_posts", args=[post.category.slug]
+    )
+    assert comment.get_edit_url() == reverse(
+        "blog:edit_comment", args=[post.id, comment.id]
+    )
+    assert comment.get_delete_url() == reverse(
+        "blog:delete_comment", args=[post.id, comment.id]
+    )
@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_reads_only_feed_table(
+        client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get("/")
+    assert len(response.context["page_obj"]) == 10
+    for query in context.captured_queries:
+        assert "JOIN" not in query["sql"], (
+            "Убедитесь, что главная страница читает публикации из таблицы "
+            "ленты без соединений."
+        )
+
+
+def test_feed_follows_category_and_comments(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 2
+    assert "(2)" in client.get("/").content.decode()
+
+    post.category.title = "Новое название"
+    post.category.save()
+    assert FeedEntry.objects.get(pk=post.pk).category_title == (
+        "Новое название"
+    )
+
+    post.category.is_published = False
+    post.category.save()
+    assert not FeedEntry.objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что публикации скрытой категории удаляются из ленты."
+    )
@@ -0,0 +1,38 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_location_change_retires_cached_cards(
+        client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/profile/{post.author.username}/"
+    assert post.location.name in client.get(url).content.decode()
+
+    post.location.is_published = False
+    with django_assert_num_queries(2):
+        # One UPDATE for the location and one for its feed entries; cached
+        # cards are retired by a single counter bump.
+        post.location.save()
+    content = client.get(url).content.decode()
+    assert post.location.name not in content, (
+        "Убедитесь, что после снятия местоположения с публикации"
+        " закэшированные карточки постов обновляются."
+    )
+    assert "Планета Земля" in content
+
+
+def test_new_post_retires_cached_category_pages(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/"
+    assert len(client.get(url).context["page_obj"]) == 1
+    mixer.blend(
+        "blog.Post",
+        category=post.category,
+        pub_date=post.pub_date,
+        is_published=True,
+    )
+    assert len(client.get(url).context["page_obj"]) == 2
@@ -0,0 +1,67 @@
+import pytest
+from django.core.mail import get_connection, send_mail
+from django.test import override_settings
+
+from blog.mail import deliver_queued
+from blog.models import QueuedEmail
+from blog.smtpstub import SMTPStub
+
+pytestmark = [pytest.mark.django_db]
+
+
+def queue_mail(subject="Сброс пароля"):
+    send_mail(
+        subject,
+        "Текст письма",
+        "from@blogicum.local",
+        ["to@blogicum.local"],
+        connection=get_connection("blog.mail.QueuedEmailBackend"),
+    )
+
+
+def test_queued_mail_delivered_over_smtp():
+    with SMTPStub() as stub, override_settings(
+        EMAIL_QUEUE_DELIVERY_BACKEND=(
+            "django.core.mail.backends.smtp.EmailBackend"
+        ),
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=stub.port,
+    ):
+        queue_mail()
+        queue_mail("Второе письмо")
+        assert not stub.messages, (
+            "Убедитесь, что письмо не отправляется в момент постановки в"
+            " очередь."
+        )
+        assert deliver_queued() == (2, 0)
+    assert [m.message["Subject"] for m in stub.messages] == [
+        "Сброс пароля",
+        "Второе письмо",
+    ]
+    assert stub.messages[0].rcpt_to == ["to@blogicum.local"]
+    assert not QueuedEmail.objects.exclude(
+        status=QueuedEmail.Status.SENT
+    ).exists()
+
+
+def test_queued_mail_retried_with_backoff():
+    stub = SMTPStub()
+    port = stub.port
+    stub.server_close()
+    queue_mail()
+    with override_settings(
+        EMAIL_QUEUE_DELIVERY_BACKEND=(
+            "django.core.mail.backends.smtp.EmailBackend"
+        ),
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=port,
+        EMAIL_TIMEOUT=1,
+    ):
+        assert deliver_queued() == (0, 1)
+        assert deliver_queued() == (0, 0), (
+            "Убедитесь, что повторная попытка откладывается."
+        )
+    queued = QueuedEmail.objects.get()
+    assert queued.status == QueuedEmail.Status.PENDING
+    assert queued.attempts == 1
+    assert queued.last_error
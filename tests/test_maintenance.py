@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test.utils import override_settings
+
+from blog import maintenance
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_backups_are_complete_copies_and_old_ones_are_deleted(
+    post_with_published_location, tmp_path
+):
+    post = post_with_published_location
+    with override_settings(BACKUP_DIR=tmp_path, BACKUP_KEEP=2, BACKUP_PAGES=1):
+        for name in ('default-20000101-000000', 'default-20000102-000000'):
+            (tmp_path / f'{name}.sqlite3').touch()
+        result = maintenance.backup()
+    backups = sorted(tmp_path.iterdir())
+    assert len(backups) == 2 and all(
+        path.suffix == '.sqlite3' for path in backups
+    ) and backups[0].name == 'default-20000102-000000.sqlite3', (
+        "Убедитесь, что хранятся только BACKUP_KEEP последних копий базы "
+        "и что незаконченных копий в каталоге не остаётся."
+    )
+    assert result['pages'] > 1
+    copy = sqlite3.connect(backups[-1])
+    try:
+        assert copy.execute('PRAGMA integrity_check').fetchone() == ('ok',)
+        assert copy.execute(
+            'SELECT title FROM blog_post WHERE id = ?', [post.pk]
+        ).fetchone() == (post.title,)
+    finally:
+        copy.close()
+
+
+def test_optimize_reports_the_time_of_each_step():
+    timings = maintenance.optimize()
+    assert set(timings) == {'analyze', 'optimize'}, (
+        "Убедитесь, что инкрементальная очистка запускается только для баз "
+        "с PRAGMA auto_vacuum=INCREMENTAL."
+    )
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_maintain_db_command(tmp_path, capsys):
+    with override_settings(BACKUP_DIR=tmp_path):
+        call_command('maintain_db', 'backup', database=['default'])
+    assert 'default backup' in capsys.readouterr().out
+    assert len(list(tmp_path.glob('default-*.sqlite3'))) == 1
+    with pytest.raises(CommandError):
+        call_command('maintain_db', 'copy')
+    with pytest.raises(CommandError):
+        call_command('maintain_db', database=['replica1'])
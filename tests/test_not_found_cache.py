@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_missing_post_cached_until_created(
+        client, django_assert_num_queries, post_with_published_location
+):
+    missing_id = post_with_published_location.id + 1
+    url = f"/posts/{missing_id}/"
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что повторный запрос несуществующего поста обслуживается"
+        " без обращения к базе данных."
+    )
+    post_with_published_location.pk = None
+    post_with_published_location.save()
+    assert post_with_published_location.id == missing_id
+    assert client.get(url).status_code == HTTPStatus.OK, (
+        "Убедитесь, что созданный пост перестаёт считаться несуществующим."
+    )
+
+
+def test_missing_category_cached_until_published(
+        client, django_assert_num_queries, mixer
+):
+    category = mixer.blend("blog.Category", is_published=False)
+    url = f"/category/{category.slug}/"
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    with django_assert_num_queries(0):
+        client.get(url)
+    category.is_published = True
+    category.save()
+    assert client.get(url).status_code == HTTPStatus.OK
+
+
+def test_missing_profile_cached(client, django_assert_num_queries, mixer):
+    url = "/profile/nobody/"
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    with django_assert_num_queries(0):
+        client.get(url)
+    mixer.blend("auth.User", username="nobody")
+    assert client.get(url).status_code == HTTPStatus.OK
@@ -0,0 +1,15 @@
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+
+
+def test_page_links_are_elided():
+    paginator = Paginator(range(10_000), 10)
+    content = render_to_string(
+        "includes/paginator.html", {"page_obj": paginator.page(500)}
+    )
+    assert content.count('class="page-item') < 20, (
+        "Убедитесь, что пагинатор не выводит ссылку на каждую страницу."
+    )
+    for number in (1, 499, 500, 501, 1000):
+        assert f">{number}<" in content
+    assert str(paginator.ELLIPSIS) in content
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Category
+from blog.reference import bump_version
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feed_queries_do_not_join_reference_tables(
+        client, user, many_posts_with_published_locations
+):
+    post = many_posts_with_published_locations[0]
+    urls = [f"/category/{post.category.slug}/", f"/profile/{user.username}/"]
+    for url in urls:
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            content = client.get(url).content.decode()
+        assert post.location.name in content
+        assert post.category.title in content
+        for query in queries:
+            assert '"blog_category"' not in query["sql"], (
+                "Убедитесь, что категории берутся из кэша справочников, "
+                "а не из запросов ленты."
+            )
+            assert '"blog_location"' not in query["sql"], (
+                "Убедитесь, что местоположения берутся из кэша справочников, "
+                "а не из запросов ленты."
+            )
+
+
+def test_saved_category_is_reloaded(client, published_category):
+    url = f"/category/{published_category.slug}/"
+    assert client.get(url).status_code == 200
+    published_category.title = "Новое название"
+    published_category.save()
+    assert "Новое название" in client.get(url).content.decode()
+    published_category.is_published = False
+    published_category.save()
+    assert client.get(url).status_code == 404
+
+
+def test_change_in_other_worker_is_seen_by_version(
+        client, settings, published_category
+):
+    settings.REFERENCE_DATA_CHECK_INTERVAL = 0
+    url = f"/category/{published_category.slug}/"
+    assert client.get(url).status_code == 200
+    # Another worker saves the category: this process only sees the
+    # version stamp in the shared cache change.
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False
+    )
+    assert client.get(url).status_code == 200
+    bump_version()
+    assert client.get(url).status_code == 404
@@ -0,0 +1,29 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_text_rendered_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = "Первая <строка>\nвторая " + "слово " * 20
+    post.save(update_fields=["text"])
+    post = Post.objects.get(pk=post.pk)
+    assert post.text_html.startswith(
+        "Первая &lt;строка&gt;<br>вторая"
+    ), "Убедитесь, что HTML текста поста обновляется при сохранении."
+    assert post.excerpt == "Первая <строка> вторая слово слово слово слово" \
+        " слово слово слово…"
+
+
+def test_backfill(post_with_published_location, comment_to_a_post):
+    Post.objects.update(text_html="", excerpt="")
+    Comment.objects.update(text_html="")
+    call_command("backfill_text", stdout=StringIO())
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    assert post.excerpt and post.text_html
+    assert Comment.objects.get(pk=comment_to_a_post.pk).text_html
@@ -0,0 +1,115 @@
+import sqlite3
+import time
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from blog import generations, replicas
+from blog.middleware import PIN_COOKIE, ReplicaMiddleware
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def copied(seconds_ago: float = 0) -> None:
+    cache.set(replicas.copied_key('replica1'), time.time() - seconds_ago)
+
+
+def read_database(request) -> str:
+    middleware = ReplicaMiddleware(
+        lambda request: HttpResponse(router.db_for_read(Post))
+    )
+    return middleware(request).content.decode()
+
+
+# Tests run in a transaction by default, which keeps reads on the primary.
+@pytest.mark.django_db(transaction=True)
+@override_settings(REPLICAS=['replica1'])
+def test_safe_requests_read_from_a_fresh_replica():
+    factory = RequestFactory()
+    copied()
+    assert read_database(factory.get('/')) == 'replica1', (
+        "Убедитесь, что GET-запросы читают ленту из реплики."
+    )
+    pinned = factory.get('/')
+    pinned.COOKIES[PIN_COOKIE] = '1'
+    assert read_database(pinned) == 'default'
+    assert read_database(factory.post('/')) == 'default'
+    copied(seconds_ago=settings.REPLICA_MAX_LAG + 1)
+    assert read_database(factory.get('/')) == 'default', (
+        "Убедитесь, что отставшая реплика не используется."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replica_is_not_used_for_writes_or_transactions():
+    with replicas.reading(('replica1', time.time())):
+        assert router.db_for_read(Post) == 'replica1'
+        assert router.db_for_write(Post) == 'default'
+        assert router.db_for_read(Session) == 'default'
+        assert router.db_for_read(Comment) == 'replica1'
+        with override_settings(DATABASES={
+            **settings.DATABASES, 'comments': settings.DATABASES['default']
+        }):
+            assert router.db_for_read(Comment) == 'comments'
+        with replicas.primary():
+            assert router.db_for_read(Post) == 'default'
+        with transaction.atomic():
+            assert router.db_for_read(Post) == 'default'
+
+
+@override_settings(REPLICAS=['replica1'])
+def test_author_reads_their_new_post_from_primary(
+        user_client, user, published_category
+):
+    copied()
+    response = user_client.post(
+        '/posts/create/',
+        {
+            'title': 'Только что написано',
+            'text': 'Текст',
+            'pub_date': '2020-01-01 00:00',
+            'category': published_category.pk,
+            'is_published': True,
+        },
+        follow=True,
+    )
+    # A replica read would fail here: the test has no replica1 connection.
+    assert response.status_code == 200
+    assert 'Только что написано' in response.content.decode(), (
+        "Убедитесь, что после создания поста автор читает свой профиль "
+        "с основной базы."
+    )
+    assert response.client.cookies[PIN_COOKIE]['max-age'] == (
+        settings.REPLICA_PIN_SECONDS
+    )
+
+
+def test_stamps_read_from_a_replica_name_the_copy():
+    primary_stamp = generations.stamp(('post', 1))
+    with replicas.reading(('replica1', 100.0)):
+        replica_stamp = generations.stamp(('post', 1))
+    assert replica_stamp != primary_stamp
+    assert replica_stamp.startswith(primary_stamp)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_copy_writes_the_primary_into_the_replica_file(
+        tmp_path, post_with_published_location
+):
+    post = post_with_published_location
+    path = tmp_path / 'replica.sqlite3'
+    databases = {**settings.DATABASES, 'replica1': {'NAME': path}}
+    with override_settings(DATABASES=databases, REPLICAS=['replica1']):
+        replicas.copy_all()
+        assert replicas.choose()[0] == 'replica1'
+    with sqlite3.connect(path) as copy:
+        assert copy.execute('SELECT title FROM blog_post').fetchall() == [
+            (post.title,)
+        ]
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+from django.db.models import Q
+from django.test.utils import override_settings
+
+from blog import shards
+from blog.models import Post
+from blog.routers import ShardRouter
+
+pytestmark = [pytest.mark.django_db]
+
+sharded = override_settings(POST_SHARDS=['posts1', 'posts2'])
+
+
+@sharded
+def test_queries_go_to_the_shards_of_their_authors_or_posts():
+    assert Post.objects.filter(author_id=3)._targets() == ['posts2'], (
+        "Убедитесь, что публикации автора читаются только из его шарда."
+    )
+    assert Post.objects.published().filter(pk=4)._targets() == ['posts1']
+    assert Post.objects.filter(pk__in=[2, 3])._targets() == [
+        'posts1', 'posts2'
+    ]
+    assert Post.objects.filter(author_id=3, pk__in=[2, 3])._targets() == [
+        'posts2'
+    ]
+    for scattered in (
+        Post.objects.all(),
+        Post.objects.filter(Q(author_id=1) | Q(author_id=3)),
+        Post.objects.exclude(author_id=1),
+    ):
+        assert scattered._targets() == ['posts1', 'posts2']
+
+
+@sharded
+def test_new_post_ids_point_to_the_shard_of_the_author():
+    ids = [shards.new_post_id(author_id) for author_id in (5, 5, 8)]
+    assert len(set(ids)) == 3
+    assert [shards.alias_for(pk) for pk in ids] == [
+        'posts2', 'posts2', 'posts1'
+    ]
+
+
+def test_new_post_ids_are_left_to_the_database_without_shards():
+    assert shards.new_post_id(5) is None
+
+
+def test_rows_of_shards_are_merged_in_query_order():
+    rows = [
+        Post(pk=pk, pub_date=datetime(2020, 1, day))
+        for pk, day in ((1, 3), (2, 1), (3, 3), (4, 2))
+    ]
+    key = Post.objects.order_by('-pub_date', 'pk')._row_key()
+    order = shards.compare(('-pub_date', 'pk'), key)
+    assert [row.pk for row in sorted(rows, key=order)] == [1, 3, 4, 2]
+    assert Post.objects.order_by('author__username')._row_key() is None
+
+
+@sharded
+def test_router_saves_posts_in_their_shard():
+    router = ShardRouter()
+    assert router.db_for_write(Post, instance=Post(author_id=3)) == 'posts2'
+    assert router.db_for_write(Post, instance=Post(pk=4, author_id=6)) == (
+        'posts1'
+    )
+    assert router.db_for_read(Post, instance=Post(pk=4)) == 'posts1'
+    assert router.db_for_write(Post) is None
+    assert router.allow_migrate('posts1', 'blog', 'comment')
+
+
+def test_router_stays_out_of_the_way_without_shards():
+    router = ShardRouter()
+    assert router.db_for_write(Post, instance=Post(author_id=3)) is None
+    assert router.allow_migrate('default', 'blog', 'post') is None
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.trending import update_rankings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_trending_feed_ordered_by_decayed_activity(
+        client, django_assert_num_queries, mixer,
+        many_posts_with_published_locations,
+):
+    quiet, busy, stale = many_posts_with_published_locations[:3]
+    now = timezone.now()
+    for post in (quiet, busy, stale):
+        post.pub_date = now - timedelta(days=1)
+        post.save()
+    mixer.cycle(1).blend("blog.Comment", post=quiet)
+    mixer.cycle(3).blend("blog.Comment", post=busy)
+    mixer.cycle(5).blend("blog.Comment", post=stale)
+    assert update_rankings(now + timedelta(seconds=1)) == 3
+    # A day later only `quiet` has received new comments.
+    later = now + timedelta(hours=24)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(timezone, "now", lambda: later - timedelta(hours=1))
+        mixer.cycle(2).blend("blog.Comment", post=quiet)
+    assert update_rankings(later) == 1
+
+    with django_assert_num_queries(2):
+        response = client.get("/trending/")
+    posts = list(response.context["page_obj"])
+    assert posts == [quiet, stale, busy], (
+        "Убедитесь, что популярные публикации отсортированы по рейтингу"
+        " с затуханием по времени."
+    )
+    assert [post.comment_count for post in posts] == [3, 5, 3]
@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.counters import post_views
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_detail_view_does_not_write(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    assert not any(
+        query["sql"].startswith(("UPDATE", "INSERT"))
+        for query in context.captured_queries
+    ), "Убедитесь, что просмотр поста не записывает в базу данных."
+    assert post_views.pending()[post.id] == 2
+
+
+def test_flush_writes_one_update(
+        django_assert_num_queries, many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations[:3]
+    for number, post in enumerate(posts, start=1):
+        for _ in range(number):
+            post_views.hit(post.id)
+    with django_assert_num_queries(1):
+        assert post_views.flush() == 6
+    assert not post_views.pending()
+    for number, post in enumerate(posts, start=1):
+        post.refresh_from_db()
+        assert post.view_count == number, (
+            "Убедитесь, что накопленные просмотры записываются в "
+            "`view_count` поста."
+        )